@@ -0,0 +1,70 @@
+"""
+Tokens per second of AcademicTextHumanizer.humanize_text with one spaCy parse
+per document, against the old flow that re-tokenized, re-tagged and
+re-parsed every sentence string.
+
+    python -m benchmarks.bench_academic [--sentences 400] [--repeat 3]
+
+The old flow is rebuilt from the humanizer's string-level methods
+(expand_contractions, convert_to_passive, replace_with_synonyms) on the full
+spaCy pipeline, NER included, as it used to be loaded.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import make_document
+from transformer import registry
+from transformer.app import AcademicTextHumanizer
+
+
+def legacy_humanize(humanizer, nlp, text, use_passive, use_synonyms):
+    transformed_sentences = []
+    for sent in nlp(text).sents:
+        sentence_str = humanizer.expand_contractions(sent.text.strip())
+        if random.random() < humanizer.p_academic_transition:
+            sentence_str = humanizer.add_academic_transitions(sentence_str)
+        if use_passive and random.random() < humanizer.p_passive:
+            sentence_str = humanizer.convert_to_passive(sentence_str)
+        if use_synonyms and random.random() < humanizer.p_synonym_replacement:
+            sentence_str = humanizer.replace_with_synonyms(sentence_str)
+        transformed_sentences.append(sentence_str)
+    return ' '.join(transformed_sentences)
+
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_document(args.sentences, seed=0)
+    humanizer = AcademicTextHumanizer()
+    full_nlp = registry.spacy_pipeline("en_core_web_sm")
+    # The old flow passed each sentence to convert_to_passive, which parsed
+    # it with the humanizer's pipeline; give it the full one.
+    legacy = AcademicTextHumanizer()
+    legacy.nlp = full_nlp
+    tokens = len(humanizer.nlp.tokenizer(text))
+    print(f"{args.sentences} sentences, {tokens} tokens; "
+          f"pipeline: {', '.join(humanizer.nlp.pipe_names)}")
+
+    for label, options in [("plain", (False, False)), ("passive+synonyms", (True, True))]:
+        old = best_of(args.repeat, lambda: legacy_humanize(legacy, full_nlp, text, *options))
+        new = best_of(args.repeat, lambda: humanizer.humanize_text(text, *options, seed=0))
+        print(f"{label:<17} before {tokens / old:10.1f} tokens/s   "
+              f"after {tokens / new:10.1f} tokens/s   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
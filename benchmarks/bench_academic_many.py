@@ -0,0 +1,58 @@
+"""
+Document throughput of AcademicTextHumanizer.humanize_many across 1..N
+parsing processes, against one humanize_text call per document.
+
+    python -m benchmarks.bench_academic_many [--documents 200] [--max-processes 4]
+
+Every run uses the same per-document seeds, so every run must produce the
+same output as the humanize_text loop; the script fails if one does not.
+Only spaCy's parse is spread over n_process processes: the transformations
+and the batched synonym selection stay in the calling process, so scaling
+flattens out once they dominate.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.corpus import make_document
+from transformer.app import AcademicTextHumanizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=20, help="sentences per document")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-synonyms", action="store_true")
+    args = parser.parse_args()
+
+    texts = [make_document(args.sentences, seed=i) for i in range(args.documents)]
+    seeds = list(range(len(texts)))
+    use_synonyms = not args.no_synonyms
+    humanizer = AcademicTextHumanizer()
+
+    start = time.perf_counter()
+    expected = []
+    for text, seed in zip(texts, seeds):
+        expected.append(humanizer.humanize_text(text, use_passive=True, use_synonyms=use_synonyms, seed=seed))
+    baseline = len(texts) / (time.perf_counter() - start)
+    print(f"{'humanize_text loop':<22} {baseline:8.1f} docs/s")
+
+    failed = False
+    for n_process in range(1, args.max_processes + 1):
+        start = time.perf_counter()
+        results = list(humanizer.humanize_many(
+            texts, use_passive=True, use_synonyms=use_synonyms,
+            batch_size=args.batch_size, n_process=n_process, seeds=seeds,
+        ))
+        rate = len(texts) / (time.perf_counter() - start)
+        same = results == expected
+        failed |= not same
+        print(f"humanize_many n={n_process:<6} {rate:8.1f} docs/s  ({rate / baseline:.2f}x)  "
+              f"{'same output' if same else 'OUTPUT DIFFERS'}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Load time, latency, throughput and resident memory of each embedding backend.
+
+    python -m benchmarks.bench_backends [--backends torch int8 onnx] [--words 5000]
+
+Every backend is measured in a fresh process so that its memory is its own:
+load time, median latency of encoding a single word (the old per-word
+synonym path), throughput of encoding distinct words in batches (the cached
+path's misses), and the process's peak resident memory. Synonym-choice
+agreement with torch is checked by benchmarks.check_backend_agreement.
+"""
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import make_sentences
+
+
+def vocabulary(count):
+    words = sorted({word.strip(".,").lower() for sentence in make_sentences(5000) for word in sentence.split()})
+    # Suffixes keep the words distinct once the corpus runs out.
+    return [f"{words[i % len(words)]}{i // len(words) or ''}" for i in range(count)]
+
+
+def measure(backend, words, batch_size):
+    from transformer.backends import load_backend
+
+    start = time.perf_counter()
+    model = load_backend("paraphrase-MiniLM-L6-v2", backend)
+    load_seconds = time.perf_counter() - start
+
+    model.encode(words[:batch_size], convert_to_numpy=True)  # warm-up
+    latencies = []
+    for word in words[:200]:
+        start = time.perf_counter()
+        model.encode([word], convert_to_numpy=True)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(words), batch_size):
+        model.encode(words[i:i + batch_size], convert_to_numpy=True)
+    throughput = len(words) / (time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "single_word_ms": statistics.median(latencies) * 1000,
+        "words_per_sec": throughput,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, vocabulary(args.words), args.batch_size)))
+        return
+
+    for backend in args.backends:
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_backends", "--child", backend,
+             "--words", str(args.words), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True,
+        )
+        if process.returncode:
+            print(f"{backend:<8} FAILED: {process.stderr.strip().splitlines()[-1]}")
+            continue
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        print(f"{backend:<8} load {result['load_seconds']:6.2f}s   "
+              f"1 word {result['single_word_ms']:7.2f} ms   "
+              f"{result['words_per_sec']:9.1f} words/s   "
+              f"peak RSS {result['max_rss_mb']:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
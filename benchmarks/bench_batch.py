@@ -0,0 +1,36 @@
+"""
+Docs/sec of humanize_batch for several worker counts.
+
+    python -m benchmarks.bench_batch [--documents 2000] [--workers 1 2 4 8]
+"""
+import argparse
+
+from benchmarks.corpus import make_document
+from transformer.batch import humanize_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=40, help="sentences per document")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--mode", default="Enhanced")
+    args = parser.parse_args()
+
+    texts = [make_document(args.sentences, seed=i) for i in range(args.documents)]
+    seeds = list(range(args.documents))
+    reference = None
+    for workers in args.workers:
+        outputs, stats = humanize_batch(texts, args.mode, ["punctuation", "formatting"], workers=workers, seeds=seeds)
+        if reference is None:
+            reference = outputs
+        utilization = [w["utilization"] for w in stats["workers"].values()]
+        print(
+            f"workers={workers:<3} {stats['docs_per_sec']:>9.1f} docs/s  "
+            f"utilization min/avg {min(utilization):.2f}/{sum(utilization) / len(utilization):.2f}  "
+            f"same output: {outputs == reference}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Synonym selection with and without the word-embedding cache.
+
+    python -m benchmarks.bench_embeddings [--sentences 3000] [--corpus essay.txt] [--cache-dir DIR]
+
+Collects every (word, synonyms) candidate that replace_with_synonyms could
+score on the corpus, then times the old two-encode-calls-per-word selection
+against the cached one and checks that both pick the same synonym.
+"""
+import argparse
+import time
+
+from benchmarks.corpus import make_sentences
+from transformer.app import AcademicTextHumanizer
+from transformer.embeddings import EmbeddingCache
+
+
+def legacy_select(model, original_word, synonyms):
+    from sentence_transformers import util
+
+    original_emb = model.encode(original_word, convert_to_tensor=True)
+    synonym_embs = model.encode(synonyms, convert_to_tensor=True)
+    cos_scores = util.cos_sim(original_emb, synonym_embs)[0]
+    max_score_index = cos_scores.argmax().item()
+    if cos_scores[max_score_index].item() >= 0.5:
+        return synonyms[max_score_index]
+    return None
+
+
+def collect_candidates(humanizer, sentences):
+    import nltk
+    from nltk.corpus import wordnet
+    from nltk.tokenize import word_tokenize
+
+    candidates = []
+    for sentence in sentences:
+        for word, pos in nltk.pos_tag(word_tokenize(sentence)):
+            if pos.startswith(('J', 'N', 'V', 'R')) and wordnet.synsets(word):
+                synonyms = humanizer._get_synonyms(word, pos)
+                if synonyms:
+                    candidates.append((word, synonyms))
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=3000)
+    parser.add_argument("--corpus", help="plain-text file to use instead of the synthetic corpus")
+    parser.add_argument("--cache-dir", help="also exercise the on-disk store in this directory")
+    parser.add_argument("--legacy-limit", type=int, default=2000,
+                        help="only time the old path on the first N candidates (it is slow)")
+    args = parser.parse_args()
+
+    if args.corpus:
+        from nltk.tokenize import sent_tokenize
+        with open(args.corpus, encoding="utf-8", errors="ignore") as corpus:
+            sentences = sent_tokenize(corpus.read())
+    else:
+        sentences = make_sentences(args.sentences)
+
+    humanizer = AcademicTextHumanizer()
+    candidates = collect_candidates(humanizer, sentences)
+    print(f"{len(sentences)} sentences, {len(candidates)} candidate words, "
+          f"{len({word for word, _ in candidates})} distinct")
+
+    subset = candidates[:args.legacy_limit]
+    start = time.perf_counter()
+    legacy = [legacy_select(humanizer.model, word, synonyms) for word, synonyms in subset]
+    legacy_rate = len(subset) / (time.perf_counter() - start)
+
+    # A fresh cache so the numbers include the cold misses.
+    humanizer.embeddings = EmbeddingCache(humanizer.model, "paraphrase-MiniLM-L6-v2", cache_dir=args.cache_dir)
+    start = time.perf_counter()
+    cached = [humanizer._select_closest_synonym(word, synonyms) for word, synonyms in candidates]
+    cached_rate = len(candidates) / (time.perf_counter() - start)
+
+    agreement = sum(a == b for a, b in zip(legacy, cached)) / len(subset) if subset else 1.0
+    print(f"uncached: {legacy_rate:10.1f} candidates/s (first {len(subset)})")
+    print(f"cached:   {cached_rate:10.1f} candidates/s")
+    print(f"same choice as uncached: {agreement:.2%}")
+    print(f"cache: {humanizer.embeddings.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Import-time guard for the library modules, measured with `python -X importtime`.
+
+    python -m benchmarks.bench_import [--budget-ms 150]
+
+Each module is imported in a fresh interpreter. The check fails (exit status 1)
+when a module takes longer than the budget or pulls in a heavy dependency that
+should only be loaded on first use.
+"""
+import argparse
+import subprocess
+import sys
+
+MODULES = [
+    "transformer.app",
+    "transformer.backends",
+    "transformer.batch",
+    "transformer.cache",
+    "transformer.cli",
+    "transformer.embeddings",
+    "transformer.humanizer",
+    "transformer.instrumentation",
+    "transformer.registry",
+    "transformer.resources",
+    "transformer.rules",
+    "transformer.scoring",
+    "transformer.segmenter",
+    "transformer.similarity",
+    "transformer.service",
+    "transformer.synonyms",
+]
+
+# Top-level packages that must never be imported as a side effect.
+HEAVY = ["nltk", "spacy", "torch", "sentence_transformers", "streamlit", "transformers"]
+
+
+def import_profile(module):
+    """Return ({top-level package: cumulative microseconds}, total microseconds) for one import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # the header line
+        top = name.strip().split(".")[0]
+        packages[top] = max(packages.get(top, 0), cumulative)
+        if name.strip() == module:
+            total = cumulative
+    return packages, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N fresh interpreters")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        packages = runs[0][0]
+        best_ms = min(total for _, total in runs) / 1000
+        heavy = [name for name in HEAVY if name in packages]
+        problems = []
+        if best_ms > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if heavy:
+            problems.append("imports " + ", ".join(heavy))
+        failed |= bool(problems)
+        print(f"{module:<25} {best_ms:8.1f} ms  {'; '.join(problems) or 'ok'}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Re-scoring a long document after small edits: IncrementalScorer against a
+full calculate_humanness_score on every version.
+
+    python -m benchmarks.bench_incremental_scoring [--sentences 2000] [--edits 200]
+
+Each version edits `--changed` random sentences of the previous one. Fails
+(exit status 1) if any incremental result differs from the full recomputation.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import make_sentences
+from transformer.humanizer import calculate_humanness_score
+from transformer.scoring import IncrementalScorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--changed", type=int, default=3, help="sentences changed per edit")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = make_sentences(args.sentences, seed=1)
+    sentences = pool
+    versions = []
+    for _ in range(args.edits):
+        sentences = list(sentences)
+        for _ in range(args.changed):
+            # An edit inside a sentence: a word from another sentence is inserted.
+            i = rng.randrange(len(sentences))
+            words = sentences[i].split()
+            words.insert(rng.randrange(len(words)), rng.choice(rng.choice(pool).split()))
+            sentences[i] = " ".join(words)
+        versions.append(" ".join(sentences))
+
+    scorer = IncrementalScorer()
+    scorer.score(versions[0])  # the first analysis scores every sentence
+    full_seconds = incremental_seconds = 0.0
+    recomputed = mismatches = 0
+    for text in versions[1:]:
+        start = time.perf_counter()
+        expected = calculate_humanness_score(text)
+        full_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = scorer.score(text)
+        incremental_seconds += time.perf_counter() - start
+        recomputed += scorer.recomputed
+        mismatches += result != expected
+
+    edits = len(versions) - 1
+    print(f"{args.sentences} sentences, {edits} edits of {args.changed} sentences")
+    print(f"full:        {full_seconds / edits * 1000:8.2f} ms per analysis")
+    print(f"incremental: {incremental_seconds / edits * 1000:8.2f} ms per analysis "
+          f"({full_seconds / incremental_seconds:.1f}x), "
+          f"{recomputed / edits:.1f} sentences rescored")
+    print(f"mismatches: {mismatches}")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
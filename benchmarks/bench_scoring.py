@@ -0,0 +1,83 @@
+"""
+Bulk humanness scoring: transformer.scoring.score_texts against one
+call per document of the old calculate_humanness_score.
+
+    python -m benchmarks.bench_scoring [--documents 10000]
+
+Fails (exit status 1) if any document's score or metrics differ.
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import make_document
+from transformer.scoring import METRICS, score_texts
+
+
+def legacy_score(text):
+    from nltk.tokenize import sent_tokenize
+
+    words = text.split()
+    word_count = len(words)
+    if word_count == 0:
+        return 0, {}
+    sentences = sent_tokenize(text)
+    sentence_count = len(sentences)
+    avg_word_length = sum(len(word) for word in words) / word_count
+    avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
+    sent_lengths = [len(s.split()) for s in sentences]
+    sentence_variance = sum((x - avg_sentence_length) ** 2 for x in sent_lengths) / len(sent_lengths) if sent_lengths else 0
+    contractions = len(re.findall(r"\b\w+'[a-z]+\b", text))
+    transitions = len(re.findall(r'\b(however|nevertheless|therefore|thus|furthermore|moreover|actually|basically)\b', text.lower()))
+    fillers = len(re.findall(r'\b(um|like|you know|sort of|basically|actually|just)\b', text.lower()))
+    score = 50
+    if sentence_variance > 10:
+        score += 20
+    elif sentence_variance > 5:
+        score += 10
+    score += min(15, contractions * 3)
+    score += min(15, transitions * 3)
+    score += min(10, fillers * 2)
+    score = max(0, min(100, score))
+    metrics = {
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "avg_word_length": avg_word_length,
+        "avg_sentence_length": avg_sentence_length,
+        "contractions": contractions,
+        "transitions": transitions,
+        "fillers": fillers
+    }
+    return score, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--sentences", type=int, default=12, help="sentences per document")
+    args = parser.parse_args()
+
+    texts = [make_document(args.sentences, seed=i) for i in range(args.documents)]
+    legacy_score(texts[0])  # load Punkt outside the timings
+
+    start = time.perf_counter()
+    expected = [legacy_score(text) for text in texts]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = score_texts(texts)
+    bulk_seconds = time.perf_counter() - start
+
+    mismatches = 0
+    for i, (score, metrics) in enumerate(expected):
+        got = {name: columns[name][i].item() for name in METRICS} if metrics else {}
+        mismatches += score != columns["score"][i] or metrics != got
+    print(f"{len(texts)} documents")
+    print(f"per document: {len(texts) / legacy_seconds:10.1f} docs/s")
+    print(f"score_texts:  {len(texts) / bulk_seconds:10.1f} docs/s ({legacy_seconds / bulk_seconds:.2f}x)")
+    print(f"mismatches: {mismatches}")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Speed of the rule-based segmenter against NLTK's Punkt on large documents.
+
+    python -m benchmarks.bench_segmenter [--sizes 100KB 1MB 10MB] [--repeat 3]
+
+For each size (synthetic and fixed-seed, or cut from --corpus) it times,
+with each segmenter: sentence splitting, word tokenizing (the stats line of
+the Streamlit app), humanness scoring and the Enhanced humanize_text, and
+prints the speedup of "regex" over "punkt". Agreement is checked by
+benchmarks.check_segmenter_agreement.
+"""
+import argparse
+
+from benchmarks.corpus import fit_text, make_text
+from benchmarks.suite import best_time, parse_size
+from transformer.humanizer import AdvancedHumanizer, calculate_humanness_score
+from transformer.segmenter import sent_tokenize, word_tokenize
+
+
+def cases(text):
+    humanizers = {segmenter: AdvancedHumanizer(segmenter=segmenter) for segmenter in ("punkt", "regex")}
+    return {
+        "sent_tokenize": lambda segmenter: sent_tokenize(text, segmenter),
+        "word_tokenize": lambda segmenter: word_tokenize(text, segmenter),
+        "score": lambda segmenter: calculate_humanness_score(text, segmenter),
+        "humanize_text": lambda segmenter: humanizers[segmenter].humanize_text(text, "Enhanced", seed=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        default=[parse_size(s) for s in ["100KB", "1MB", "10MB"]])
+    parser.add_argument("--corpus", help="text file cut or repeated to each size instead of the synthetic corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = None
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8", errors="ignore") as corpus:
+            source = corpus.read()
+
+    # Load Punkt before timing anything.
+    sent_tokenize("Warm up.", "punkt")
+    for size in args.sizes:
+        text = fit_text(source, size) if source is not None else make_text(size)
+        print(f"{len(text) / 1e6:.2f} MB, {len(sent_tokenize(text, 'punkt'))} Punkt sentences")
+        for name, run in cases(text).items():
+            punkt = best_time(lambda: run("punkt"), args.repeat)
+            regex = best_time(lambda: run("regex"), args.repeat)
+            print(f"  {name:<14} punkt {punkt * 1000:10.1f} ms   regex {regex * 1000:10.1f} ms   "
+                  f"{punkt / regex:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
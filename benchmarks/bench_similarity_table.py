@@ -0,0 +1,93 @@
+"""
+Synonym choices from the precomputed similarity table versus the live model.
+
+    python -m benchmarks.bench_similarity_table [--sentences 2000] [--table PATH]
+
+Builds the table first if PATH does not exist (this runs the model over the
+whole synonym index and takes a while). Every synonym candidate of the
+corpus is then resolved both ways; the choices are compared and each path
+is timed. Finally a fresh process is started in each mode to measure
+humanizer startup time, peak resident memory and whether torch was loaded.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import make_sentences
+from transformer.app import AcademicTextHumanizer
+from transformer.embeddings import EmbeddingCache, closest_synonyms
+from transformer.similarity import SimilarityTable, build_table, default_table_path
+from transformer.synonyms import SynonymIndex, default_index_path, wordnet_pos
+
+STARTUP = """
+import json, resource, sys, time
+start = time.perf_counter()
+from transformer.app import AcademicTextHumanizer
+humanizer = AcademicTextHumanizer(synonym_table_path=sys.argv[1] or None)
+humanizer.humanize_text("The committee reviewed the proposal and approved the budget.", use_synonyms=True, seed=0)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "torch": "torch" in sys.modules,
+}))
+"""
+
+
+def startup(table_path):
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP, table_path or ""],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--table", default=default_table_path())
+    parser.add_argument("--index", default=default_index_path())
+    args = parser.parse_args()
+
+    if not os.path.exists(args.table):
+        start = time.perf_counter()
+        entries = build_table(args.table, index=SynonymIndex(args.index))
+        print(f"built {args.table}: {entries} entries in {time.perf_counter() - start:.1f}s")
+    table = SimilarityTable(args.table)
+    print(f"table: {os.path.getsize(args.table) / 1e6:.1f} MB, {len(table)} keys")
+
+    humanizer = AcademicTextHumanizer(synonym_index_path=args.index)
+    rng = random.Random(0)
+    candidates = [
+        (word, pos, synonyms)
+        for doc in humanizer.nlp.pipe(make_sentences(args.sentences))
+        for _, word, pos, synonyms in humanizer._plan_tagged([(token.text, token.tag_) for token in doc], rng)[1]
+    ]
+
+    cache = EmbeddingCache(humanizer.model, humanizer.model_name)
+    start = time.perf_counter()
+    live = closest_synonyms(cache, [(word, synonyms) for word, _, synonyms in candidates])
+    live_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    looked_up = [table.closest(word, wordnet_pos(pos)) for word, pos, _ in candidates]
+    table_seconds = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(live, looked_up)) / len(candidates) if candidates else 1.0
+    print(f"{len(candidates)} candidates")
+    print(f"model (cold cache): {len(candidates) / live_seconds:12.1f} candidates/s")
+    print(f"table:              {len(candidates) / table_seconds:12.1f} candidates/s "
+          f"({live_seconds / table_seconds:.1f}x)")
+    print(f"same choice as the model: {agreement:.2%}")
+
+    for label, path in [("model", None), ("table", args.table)]:
+        result = startup(path)
+        print(f"startup with {label}: {result['seconds']:6.2f}s  "
+              f"peak RSS {result['max_rss_mb']:8.1f} MB  torch loaded: {result['torch']}")
+
+
+if __name__ == "__main__":
+    main()
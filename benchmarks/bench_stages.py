@@ -0,0 +1,74 @@
+"""
+Per-stage cost of AdvancedHumanizer on a synthetic document.
+
+    python -m benchmarks.bench_stages [--sentences 5000] [--repeat 3] [--json]
+
+Each stage is timed on its own over the whole corpus, with the same seed per
+repetition, and the best repetition is reported as microseconds per sentence.
+"""
+import argparse
+import json
+import random
+import time
+
+from nltk.tokenize import sent_tokenize
+
+from benchmarks.corpus import make_document
+from transformer import rules
+from transformer.humanizer import AdvancedHumanizer
+
+TECHNIQUES = ["typos", "punctuation", "repetition", "formatting"]
+
+
+def stages(humanizer, document, sentences, mode):
+    rates = rules.PASS_RATES[mode]
+    return {
+        "sent_tokenize": lambda: sent_tokenize(document),
+        "expand_contractions": lambda: [humanizer._expand_contractions(s) for s in sentences],
+        "transformations": lambda: [humanizer._matcher.apply_passes(s, rates) for s in sentences],
+        "natural_flow": lambda: [humanizer._add_natural_flow(s) for s in sentences],
+        "vary_structure": lambda: [humanizer._vary_structure(s, i) for i, s in enumerate(sentences)],
+        "conversational": lambda: [humanizer._add_conversational(s, i) for i, s in enumerate(sentences)],
+        "techniques": lambda: [humanizer._apply_techniques(s, TECHNIQUES) for s in sentences],
+        "fix_punctuation": lambda: [humanizer._fix_punctuation(s) for s in sentences],
+    }
+
+
+def measure(func, repeat, seed):
+    best = float("inf")
+    for _ in range(repeat):
+        random.seed(seed)
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=5000)
+    parser.add_argument("--mode", default="Enhanced", choices=list(rules.PASS_RATES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    humanizer = AdvancedHumanizer()
+    document = make_document(args.sentences, seed=args.seed)
+    sentences = sent_tokenize(document)
+
+    results = {
+        name: measure(func, args.repeat, args.seed) * 1e6 / len(sentences)
+        for name, func in stages(humanizer, document, sentences, args.mode).items()
+    }
+
+    if args.json:
+        print(json.dumps({"sentences": len(sentences), "mode": args.mode, "us_per_sentence": results}, indent=2))
+        return
+    print(f"{len(sentences)} sentences, mode {args.mode}")
+    for name, cost in sorted(results.items(), key=lambda item: -item[1]):
+        print(f"  {name:<25} {cost:>9.2f} us/sentence")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Synonym lookups from the precomputed index versus live WordNet queries.
+
+    python -m benchmarks.bench_synonym_index [--sentences 3000] [--index PATH]
+
+Builds the index first if PATH does not exist. For every tagged token of the
+corpus, both paths answer the two questions replace_with_synonyms asks
+(does the word have synsets, and what are its synonyms for this tag); the
+answers are compared and each path is timed.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.corpus import make_sentences
+from transformer.synonyms import (
+    SynonymIndex, build_index, default_index_path, wordnet_pos, wordnet_synonyms,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=3000)
+    parser.add_argument("--index", default=default_index_path())
+    args = parser.parse_args()
+
+    import nltk
+    from nltk.corpus import wordnet
+    from nltk.tokenize import word_tokenize
+
+    if not os.path.exists(args.index):
+        start = time.perf_counter()
+        keys = build_index(args.index)
+        print(f"built {args.index}: {keys} keys in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    index = SynonymIndex(args.index)
+    print(f"index: {os.path.getsize(args.index) / 1e6:.1f} MB, "
+          f"opened in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    tagged = [
+        (word, wordnet_pos(pos))
+        for sentence in make_sentences(args.sentences)
+        for word, pos in nltk.pos_tag(word_tokenize(sentence))
+        if wordnet_pos(pos)
+    ]
+    wordnet.ensure_loaded()
+
+    start = time.perf_counter()
+    live = [(bool(wordnet.synsets(word)), wordnet_synonyms(word, wn_pos)) for word, wn_pos in tagged]
+    live_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [(index.known(word), index.synonyms(word, wn_pos)) for word, wn_pos in tagged]
+    index_seconds = time.perf_counter() - start
+
+    mismatches = [word for (word, _), a, b in zip(tagged, live, indexed) if a != b]
+    print(f"{len(tagged)} tagged tokens")
+    print(f"live WordNet: {len(tagged) / live_seconds:12.1f} lookups/s")
+    print(f"index:        {len(tagged) / index_seconds:12.1f} lookups/s "
+          f"({live_seconds / index_seconds:.1f}x)")
+    print(f"mismatches: {len(mismatches)} {sorted(set(mismatches))[:10]}")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
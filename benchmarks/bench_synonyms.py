@@ -0,0 +1,59 @@
+"""
+Throughput of synonym selection: one model call per word (the old path)
+versus batching per sentence and per document.
+
+    python -m benchmarks.bench_synonyms [--sentences 2000]
+
+Each batched variant starts from an empty embedding cache, so the numbers
+measure batching rather than cache reuse. The choices of every variant are
+compared against the per-word path.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_embeddings import legacy_select
+from benchmarks.corpus import make_sentences
+from transformer.app import AcademicTextHumanizer
+from transformer.embeddings import EmbeddingCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    humanizer = AcademicTextHumanizer()
+    random.seed(args.seed)
+    plans = [humanizer._plan_synonyms(sentence) for sentence in make_sentences(args.sentences, args.seed)]
+    candidates = sum(len(candidates) for _, candidates in plans)
+    print(f"{len(plans)} sentences, {candidates} candidate words")
+
+    start = time.perf_counter()
+    per_word = []
+    for tokens, candidates_ in plans:
+        new_tokens = list(tokens)
+        for i, word, _, synonyms in candidates_:
+            new_tokens[i] = legacy_select(humanizer.model, word, synonyms) or word
+        per_word.append(' '.join(new_tokens))
+    results = {"per word": (per_word, time.perf_counter() - start)}
+
+    humanizer.embeddings = EmbeddingCache(humanizer.model, "paraphrase-MiniLM-L6-v2")
+    start = time.perf_counter()
+    per_sentence = [humanizer._resolve_synonyms([plan])[0] for plan in plans]
+    results["per sentence"] = (per_sentence, time.perf_counter() - start)
+
+    humanizer.embeddings = EmbeddingCache(humanizer.model, "paraphrase-MiniLM-L6-v2")
+    start = time.perf_counter()
+    per_document = humanizer._resolve_synonyms(plans)
+    results["per document"] = (per_document, time.perf_counter() - start)
+
+    for name, (sentences, elapsed) in results.items():
+        same = sum(a == b for a, b in zip(sentences, per_word)) / len(plans)
+        print(f"{name:<13} {len(plans) / elapsed:10.1f} sentences/s  "
+              f"{candidates / elapsed:10.1f} words/s  same as per word: {same:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Sentences/sec of the transformation passes: the old per-phrase loop, one
+PhraseMatcher scan per pass, and the single-scan engine behind humanize_text.
+
+    python -m benchmarks.bench_transformations [--sentences 2000 5000] [--passes 9]
+    python -m benchmarks.bench_transformations --check [--runs 2000]
+
+The "before" numbers come from a verbatim copy of the old per-phrase loop, run
+with the same seed so the outputs can also be checked for equality. --check
+compares the old loop and the single-scan engine on the corpus templates and
+on sentences where a replacement completes a phrase across its own edge: it
+requires identical output under shared seeds, and compares how often each
+replacement is produced under independent seeds.
+"""
+import argparse
+import math
+import random
+import re
+import time
+from collections import Counter
+
+from benchmarks.corpus import TEMPLATES, make_sentences
+from transformer.humanizer import AdvancedHumanizer
+from transformer.rules import PASS_RATES
+
+# A replacement here forms a new phrase with the words next to it, e.g.
+# "particularly across many" -> "particularly in many" -> "mainly in many".
+STRADDLES = [
+    "Growth was weak particularly across many regions.",
+    "It failed particularly despite various attempts.",
+    "Sales fell particularly across various markets, despite many efforts.",
+]
+
+
+def legacy_apply_transformations(transformations, sentence, pass_num):
+    replacement_rate = 0.999 - (pass_num * 0.01)
+
+    sorted_transforms = sorted(
+        transformations.items(),
+        key=lambda x: len(x[0].split()),
+        reverse=True
+    )
+
+    for original, options in sorted_transforms:
+        if original.lower() in sentence.lower():
+            if random.random() < replacement_rate:
+                replacement = random.choice(options)
+
+                def preserve_case(match):
+                    matched = match.group(0)
+                    if matched[0].isupper():
+                        return replacement[0].upper() + replacement[1:]
+                    return replacement
+
+                sentence = re.sub(
+                    r'\b' + re.escape(original) + r'\b',
+                    preserve_case,
+                    sentence,
+                    count=1,
+                    flags=re.IGNORECASE
+                )
+
+    return sentence
+
+
+def run(sentences, passes, apply, seed):
+    random.seed(seed)
+    start = time.perf_counter()
+    out = []
+    for sentence in sentences:
+        for pass_num in range(passes):
+            sentence = apply(sentence, pass_num)
+        out.append(sentence)
+    return out, time.perf_counter() - start
+
+
+def run_single_scan(sentences, rates, matcher, seed):
+    random.seed(seed)
+    start = time.perf_counter()
+    out = [matcher.apply_passes(sentence, rates) for sentence in sentences]
+    return out, time.perf_counter() - start
+
+
+def replacement_frequencies(humanizer, sentences, runs, transform):
+    """Fraction of runs in which each replacement option shows up per template."""
+    counts = Counter()
+    options = {option for values in humanizer.transformations.values() for option in values}
+    for run_num in range(runs):
+        for template, sentence in enumerate(sentences):
+            lowered = transform(sentence, run_num).lower()
+            counts.update((template, option) for option in options if option.lower() in lowered)
+    return {key: value / runs for key, value in counts.items()}
+
+
+def check_equivalence(humanizer, mode, runs, tolerance):
+    table = humanizer.transformations
+    rates = PASS_RATES[mode]
+    sentences = [t.format(topic="climate policy", effect="rising costs") for t in TEMPLATES] + STRADDLES
+
+    def loop(sentence, run_num):
+        random.seed(run_num)
+        for pass_num in range(len(rates)):
+            sentence = legacy_apply_transformations(table, sentence, pass_num)
+        return sentence
+
+    def single_scan(sentence, run_num):
+        random.seed(runs + run_num)
+        return humanizer._matcher.apply_passes(sentence, rates)
+
+    def single_scan_same_seed(sentence, run_num):
+        random.seed(run_num)
+        return humanizer._matcher.apply_passes(sentence, rates)
+
+    differing = sum(
+        loop(sentence, run_num) != single_scan_same_seed(sentence, run_num)
+        for sentence in sentences for run_num in range(runs)
+    )
+    expected = replacement_frequencies(humanizer, sentences, runs, loop)
+    observed = replacement_frequencies(humanizer, sentences, runs, single_scan)
+
+    # Two-proportion z-score per (template, replacement) pair.
+    worst = 0.0
+    for key in expected.keys() | observed.keys():
+        p1, p2 = expected.get(key, 0.0), observed.get(key, 0.0)
+        pooled = (p1 + p2) / 2
+        spread = math.sqrt(2 * pooled * (1 - pooled) / runs)
+        if spread:
+            worst = max(worst, abs(p1 - p2) / spread)
+    print(f"{mode}: {differing} of {len(sentences) * runs} seeded outputs differ, "
+          f"{len(expected)} (template, replacement) pairs, max |z| {worst:.2f} (limit {tolerance})")
+    return differing == 0 and worst <= tolerance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs="+", default=[2000, 5000, 20000])
+    parser.add_argument("--passes", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="run the statistical equivalence check")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--tolerance", type=float, default=4.5, help="largest |z| accepted by --check")
+    args = parser.parse_args()
+
+    humanizer = AdvancedHumanizer()
+    table = humanizer.transformations
+
+    if args.check:
+        ok = all(check_equivalence(humanizer, mode, args.runs, args.tolerance) for mode in PASS_RATES)
+        raise SystemExit(0 if ok else 1)
+
+    def legacy(sentence, pass_num):
+        return legacy_apply_transformations(table, sentence, pass_num)
+
+    rates = tuple(0.999 - (pass_num * 0.01) for pass_num in range(args.passes))
+    print(f"{'sentences':>10} {'loop/s':>10} {'per-pass/s':>11} {'1-scan/s':>10} {'speedup':>8}  same output")
+    for count in args.sentences:
+        sentences = make_sentences(count, seed=args.seed)
+        before, t_before = run(sentences, args.passes, legacy, args.seed)
+        per_pass, t_per_pass = run(sentences, args.passes, humanizer._apply_transformations, args.seed)
+        single, t_single = run_single_scan(sentences, rates, humanizer._matcher, args.seed)
+        print(
+            f"{count:>10} {count / t_before:>10.0f} {count / t_per_pass:>11.0f} "
+            f"{count / t_single:>10.0f} {t_before / t_single:>7.1f}x  {before == per_pass == single}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Synonym-choice agreement of each embedding backend with the full-precision
+torch model.
+
+    python -m benchmarks.check_backend_agreement [--backends int8 onnx] [--min-agreement 0.95]
+
+Collects every synonym candidate the academic humanizer considers on the
+corpus, chooses among each candidate's synonyms with every backend, and
+reports how often the choice (including "no synonym above the threshold")
+matches the torch one, along with the mean cosine similarity between the
+backends' embeddings and torch's. Exits with status 1 if any agreement is
+below the minimum.
+"""
+import argparse
+import random
+
+import numpy as np
+
+from benchmarks.corpus import make_sentences
+from transformer import registry
+from transformer.app import AcademicTextHumanizer
+from transformer.embeddings import EmbeddingCache, closest_synonyms
+
+
+def synonym_candidates(humanizer, sentences, seed=0):
+    """(word, synonyms) for every synonym candidate the humanizer plans on `sentences`."""
+    rng = random.Random(seed)
+    return [
+        (word, synonyms)
+        for doc in humanizer.nlp.pipe(sentences)
+        for _, word, _, synonyms in humanizer._plan_tagged([(token.text, token.tag_) for token in doc], rng)[1]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"])
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    humanizer = AcademicTextHumanizer()
+    candidates = synonym_candidates(humanizer, make_sentences(args.sentences))
+    vocabulary = list(dict.fromkeys(word for original, synonyms in candidates for word in (original, *synonyms)))
+    print(f"{len(candidates)} candidates, {len(vocabulary)} distinct words")
+
+    baseline_cache = EmbeddingCache(humanizer.model, humanizer.model_name)
+    baseline = closest_synonyms(baseline_cache, candidates)
+    baseline_vectors = baseline_cache.encode(vocabulary)
+
+    failed = False
+    for backend in args.backends:
+        cache = EmbeddingCache(registry.sentence_transformer(humanizer.model_name, backend), humanizer.model_name)
+        choices = closest_synonyms(cache, candidates)
+        agreement = sum(a == b for a, b in zip(baseline, choices)) / len(candidates) if candidates else 1.0
+        vectors = cache.encode(vocabulary)
+        cosine = np.sum(vectors * baseline_vectors, axis=1) / np.maximum(
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(baseline_vectors, axis=1), 1e-8
+        )
+        status = "ok" if agreement >= args.min_agreement else "TOO LOW"
+        failed |= agreement < args.min_agreement
+        print(f"{backend:<8} same choice {agreement:8.2%}   embedding cosine mean {cosine.mean():.4f} "
+              f"min {cosine.min():.4f}  {status}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
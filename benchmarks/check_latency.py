@@ -0,0 +1,52 @@
+"""
+Latency guard for small inputs: humanizing or scoring a short text must take
+milliseconds, not seconds.
+
+    python -m benchmarks.check_latency [--limit-ms 50]
+
+Exits with status 1 if any median latency is above the limit.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.corpus import make_document
+from transformer.humanizer import AdvancedHumanizer, calculate_humanness_score
+
+
+def median_ms(func, repeat):
+    func()  # warm-up: loads Punkt and compiles lazily built state
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit-ms", type=float, default=50.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    humanizer = AdvancedHumanizer()
+    text = make_document(10, seed=0)
+    techniques = ["typos", "punctuation", "repetition", "formatting"]
+    checks = {
+        f"humanize_text {mode}": (lambda mode=mode: humanizer.humanize_text(text, mode, techniques))
+        for mode in ["Basic", "Aggressive", "Enhanced"]
+    }
+    checks["calculate_humanness_score"] = lambda: calculate_humanness_score(text)
+
+    failed = False
+    for name, func in checks.items():
+        latency = median_ms(func, args.repeat)
+        status = "ok" if latency <= args.limit_ms else "TOO SLOW"
+        failed |= latency > args.limit_ms
+        print(f"{name:<30} {latency:8.2f} ms  {status}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
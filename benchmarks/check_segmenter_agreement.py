@@ -0,0 +1,106 @@
+"""
+Agreement of transformer.segmenter with NLTK's Punkt sentence splitter and
+word_tokenize.
+
+    python -m benchmarks.check_segmenter_agreement [--corpus FILE ...] [--min-agreement 0.99]
+
+The reference corpus is the paragraphs below (abbreviations, initials,
+numbers, quotes, ellipses, contractions), the synthetic benchmark corpus,
+and any --corpus files (one document per blank-line separated paragraph).
+For sentences it reports how many documents are split identically and the
+precision and recall of the rule-based sentence ends against Punkt's; for
+words, how many of Punkt's sentences get the same tokens (word_tokenize's
+`` and '' quotes count as "). Disagreements are printed with --show. Exits
+with status 1 if sentence-end F1 or word agreement is below the minimum.
+"""
+import argparse
+
+from benchmarks.corpus import make_document
+from transformer.segmenter import _WORD_TOKEN, split_sentences
+
+REFERENCE = [
+    "Mr. Smith met Dr. Jones at 5 p.m. on Friday. They talked about the U.S. economy for an hour.",
+    "The results (see Fig. 3) were mixed. Costs rose by 3.5% in 2020. Sales fell, e.g. in Europe and Asia.",
+    "J. R. R. Tolkien wrote the book. It sold well.",
+    "\"Are you coming?\" she asked. \"No,\" he said. \"I'm tired.\"",
+    "It wasn't clear what they'd do. We can't wait. They'll see. I'm sure you've heard.",
+    "We bought apples, pears, etc. and went home. The rest of the day was quiet.",
+    "Wait... what happened? I don't know! Nobody does...",
+    "The meeting starts at 10:30 a.m. sharp. Bring 1,000 copies.",
+    "He lives on Main St. near the park. His office is in Washington.",
+    "Prof. Brown's lecture covered Vol. 2 of the series. Students liked it.",
+    "The company (Acme Inc.) grew fast. Its founder, Jane Doe, left in 2019.",
+    "Is this the end? Perhaps. Or perhaps not!",
+    "Read chapter 4. Then answer the questions in section 4.2. Finally, hand it in.",
+    "The well-known author -- who rarely speaks -- gave a talk. It was brief.",
+    "The students' essays were graded. Each got a mark out of 10.",
+]
+
+
+def word_tokens(tokenizer, sentence):
+    return ['"' if token in ("``", "''") else token for token in tokenizer.tokenize(sentence)]
+
+
+def sentence_ends(sentences, text):
+    """Character offsets at which each sentence ends in `text`."""
+    ends, position = set(), 0
+    for sentence in sentences:
+        position = text.index(sentence, position) + len(sentence)
+        ends.add(position)
+    return ends
+
+
+def main():
+    from nltk.tokenize import sent_tokenize
+    from nltk.tokenize.destructive import NLTKWordTokenizer
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", nargs="*", default=[], help="text files to add to the reference corpus")
+    parser.add_argument("--sentences", type=int, default=2000, help="sentences of synthetic corpus")
+    parser.add_argument("--min-agreement", type=float, default=0.99)
+    parser.add_argument("--show", type=int, default=10, help="disagreements to print")
+    args = parser.parse_args()
+
+    documents = REFERENCE + make_document(args.sentences).split("\n\n")
+    for path in args.corpus:
+        with open(path, encoding="utf-8", errors="ignore") as corpus:
+            documents += [paragraph for paragraph in corpus.read().split("\n\n") if paragraph.strip()]
+
+    tokenizer = NLTKWordTokenizer()
+    same_documents = matched = predicted = expected = 0
+    same_words = sentences = shown = 0
+    for text in documents:
+        punkt = sent_tokenize(text)
+        rules = split_sentences(text)
+        same_documents += punkt == rules
+        punkt_ends, rule_ends = sentence_ends(punkt, text), sentence_ends(rules, text)
+        matched += len(punkt_ends & rule_ends)
+        predicted += len(rule_ends)
+        expected += len(punkt_ends)
+        if punkt != rules and shown < args.show:
+            shown += 1
+            print(f"sentences differ:\n  punkt {punkt}\n  regex {rules}")
+        for sentence in punkt:
+            same = _WORD_TOKEN.findall(sentence) == word_tokens(tokenizer, sentence)
+            same_words += same
+            sentences += 1
+            if not same and shown < args.show:
+                shown += 1
+                print(f"words differ in {sentence!r}:\n  punkt {word_tokens(tokenizer, sentence)}\n"
+                      f"  regex {_WORD_TOKEN.findall(sentence)}")
+
+    precision = matched / predicted if predicted else 1.0
+    recall = matched / expected if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    words = same_words / sentences if sentences else 1.0
+    print(f"{len(documents)} documents, {expected} Punkt sentences")
+    print(f"documents split identically: {same_documents / len(documents):.2%}")
+    print(f"sentence ends: precision {precision:.4f}  recall {recall:.4f}  F1 {f1:.4f}")
+    print(f"sentences with identical word tokens: {words:.2%}")
+    failed = f1 < args.min_agreement or words < args.min_agreement
+    print("TOO LOW" if failed else "ok")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Protocol guard for the HTTP service: malformed requests must get an HTTP
+error response, not a dropped connection.
+
+    python -m benchmarks.check_service [--url http://127.0.0.1:8000]
+
+Without --url, a service is started in this process on a free port. Each
+case is sent on its own connection; exits with status 1 if any response
+status differs from the expected one.
+"""
+import argparse
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from benchmarks.load_test import start_local_service
+
+SCORE = json.dumps({"text": "It is what it is."}).encode("utf-8")
+STRING_FLAG = json.dumps({"text": "It is what it is.", "use_passive": "false"}).encode("utf-8")
+NUMBER_FLAG = json.dumps({"text": "It is what it is.", "use_synonyms": 0}).encode("utf-8")
+CASES = [
+    ("valid request", "/score", f"Content-Length: {len(SCORE)}\r\n", SCORE, 200),
+    ("negative Content-Length", "/score", "Content-Length: -5\r\n", b"", 400),
+    ("non-integer Content-Length", "/score", "Content-Length: ten\r\n", b"", 400),
+    ("body over max_body", "/score", "Content-Length: 999999999999\r\n", b"", 413),
+    ("chunked body", "/score", "Transfer-Encoding: chunked\r\n", b"0\r\n\r\n", 411),
+    ("invalid JSON", "/score", "Content-Length: 5\r\n", b"{oops", 400),
+    ('use_passive "false"', "/humanize/academic", f"Content-Length: {len(STRING_FLAG)}\r\n", STRING_FLAG, 400),
+    ("use_synonyms 0", "/humanize/academic", f"Content-Length: {len(NUMBER_FLAG)}\r\n", NUMBER_FLAG, 400),
+]
+
+
+async def send(host, port, path, headers, body):
+    """Status of the response to one POST to `path`, or None if the connection dropped."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: check\r\nConnection: close\r\n{headers}\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        line = await reader.readline()
+        return int(line.split()[1]) if line else None
+    finally:
+        writer.close()
+
+
+async def check(host, port):
+    failed = False
+    for name, path, headers, body, expected in CASES:
+        status = await send(host, port, path, headers, body)
+        failed |= status != expected
+        print(f"{name:<28} {status if status is not None else 'no response'!s:>12}  "
+              f"{'ok' if status == expected else f'EXPECTED {expected}'}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="service to check (default: start one in this process)")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", start_local_service(argparse.Namespace(workers=1, max_pending=8, max_batch=8))
+    raise SystemExit(1 if asyncio.run(check(host, port)) else 0)
+
+
+if __name__ == "__main__":
+    main()
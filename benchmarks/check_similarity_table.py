@@ -0,0 +1,68 @@
+"""
+Lookup rules of the precomputed synonym-similarity table, checked on a small
+hand-written table (no model or WordNet needed).
+
+    python -m benchmarks.check_similarity_table
+
+closest_among() must choose as the model would among the given synonyms:
+the best-scoring match across parts of speech, not the first part of speech
+that has one. Exits with status 1 if any case gives another choice.
+"""
+import os
+import sys
+import tempfile
+
+from transformer.similarity import MODEL_KEY, SCORE, SimilarityTable
+
+# (word, part of speech) -> (best synonym, cosine similarity)
+ENTRIES = {
+    ("run", "n"): ("running", 0.55),
+    ("run", "v"): ("operate", 0.82),
+    ("light", "a"): ("bright", 0.40),
+    ("light", "n"): ("lamp", 0.70),
+    ("fast", "a"): ("quick", 0.45),
+    ("dog", "n"): ("hound", 0.90),
+    ("Dog", "n"): ("Hound", 0.88),
+}
+
+# (word, synonyms, expected choice)
+CASES = [
+    # The noun's match is listed first, but the verb's scores higher.
+    ("run", ["running", "operate", "go"], "operate"),
+    # Only the noun's best synonym is a candidate.
+    ("run", ["running", "go"], "running"),
+    # The adjective's match is below the threshold, the noun's is not.
+    ("light", ["bright", "lamp"], "lamp"),
+    ("fast", ["quick"], None),
+    ("dog", ["frump"], None),
+    ("Dog", ["Hound", "hound"], "Hound"),
+    ("DOG", ["hound"], "hound"),
+]
+
+
+def write_table(path):
+    import marisa_trie
+
+    items = [(MODEL_KEY, b"check")]
+    items += [(f"{word}\t{wn_pos}", SCORE.pack(score) + synonym.encode("utf-8"))
+              for (word, wn_pos), (synonym, score) in ENTRIES.items()]
+    marisa_trie.BytesTrie(items).save(path)
+
+
+def main():
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.marisa")
+        write_table(path)
+        table = SimilarityTable(path)
+        for word, synonyms, expected in CASES:
+            chosen = table.closest_among(word, synonyms)
+            failed |= chosen != expected
+            print(f"{word:<6} {str(synonyms):<32} -> {chosen!s:<8} "
+                  f"{'ok' if chosen == expected else f'EXPECTED {expected}'}")
+        del table
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
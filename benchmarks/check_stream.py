@@ -0,0 +1,69 @@
+"""
+Stream/batch equality of AdvancedHumanizer: joining the pieces of
+humanize_stream must give exactly humanize_text's output, however the input
+is chunked.
+
+    python -m benchmarks.check_stream [--chunkings 200] [--sentences 60]
+
+For each segmenter it streams a synthetic document cut into random chunks,
+and the boundary cases below (sentence ends that the segmenters treat
+differently at the end of a text, such as "?!") cut at every position.
+Exits with status 1 if any output differs.
+"""
+import argparse
+import random
+
+from benchmarks.corpus import make_document
+from transformer.humanizer import AdvancedHumanizer
+from transformer.segmenter import SEGMENTERS
+
+BOUNDARY_CASES = [
+    "Really?! I think so. Ok.",
+    "Is it done? Really?! I think so. \"Wait!?\" he said. Fine!! Done...",
+    "What?!? No!!! Yes. Mr. Smith left at 5 p.m. today.",
+]
+TECHNIQUES = ["typos", "punctuation", "repetition", "formatting"]
+
+
+def random_cuts(text, rng, max_chunk):
+    cuts, position = [], 0
+    while position < len(text):
+        cuts.append(text[position:position + rng.randint(1, max_chunk)])
+        position += len(cuts[-1])
+    return cuts
+
+
+def check(humanizer, text, chunkings):
+    """Number of chunkings whose streamed output differs from humanize_text."""
+    expected = humanizer.humanize_text(text, "Enhanced", TECHNIQUES, seed=0)
+    return sum(
+        "".join(humanizer.humanize_stream(chunks, "Enhanced", TECHNIQUES, seed=0)) != expected
+        for chunks in chunkings
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunkings", type=int, default=200, help="random chunkings of the document")
+    parser.add_argument("--sentences", type=int, default=60, help="sentences of synthetic document")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    document = make_document(args.sentences, args.seed)
+    failed = False
+    for segmenter in SEGMENTERS:
+        humanizer = AdvancedHumanizer(segmenter=segmenter)
+        cases = {"document": (document, [random_cuts(document, rng, 80) for _ in range(args.chunkings)])}
+        for i, text in enumerate(BOUNDARY_CASES):
+            cases[f"boundary {i}"] = (text, [[text[:cut], text[cut:]] for cut in range(1, len(text))])
+        for name, (text, chunkings) in cases.items():
+            differing = check(humanizer, text, chunkings)
+            failed |= differing > 0
+            print(f"{segmenter:<6} {name:<11} {differing:4d} of {len(chunkings)} chunkings differ  "
+                  f"{'ok' if not differing else 'MISMATCH'}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
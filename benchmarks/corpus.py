@@ -0,0 +1,68 @@
+import random
+
+# Sentence templates built around the phrases the humanizers react to, mixed
+# with neutral filler so that not every sentence hits the transformation table.
+TEMPLATES = [
+    "The current state of {topic} reveals various concerning trends.",
+    "Besides, the {topic} framework holds strong evidence of {effect}.",
+    "This approach not only affects {topic} but also contributes to {effect}.",
+    "However, the common view refers to {topic} as a basic requirement.",
+    "Additionally, the report includes poor results particularly in {topic}.",
+    "Furthermore, the method ensures that {effect} is measured across many sites.",
+    "Therefore, despite various limitations, the model encompasses {topic}.",
+    "The team didn't expect {effect} to change so quickly.",
+    "In addition, researchers can't ignore how {topic} shows {effect}.",
+    "Moreover, it is clear that {topic} and {effect} are related.",
+    "We walked to the station and waited for the train.",
+    "She said the results were fine, and that was the end of it.",
+]
+
+TOPICS = [
+    "climate policy", "public health", "machine learning", "urban planning",
+    "education reform", "supply chains", "renewable energy", "data privacy",
+]
+
+EFFECTS = [
+    "rising costs", "better outcomes", "slower growth", "new risks",
+    "wider access", "lower emissions", "greater trust", "reduced waste",
+]
+
+
+def make_sentences(count, seed=0):
+    """Return `count` synthetic sentences, reproducible for a given seed."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS), effect=rng.choice(EFFECTS))
+        for _ in range(count)
+    ]
+
+
+def make_document(sentence_count, seed=0, sentences_per_paragraph=6):
+    """Return a synthetic document made of short paragraphs."""
+    sentences = make_sentences(sentence_count, seed)
+    paragraphs = [
+        ' '.join(sentences[i:i + sentences_per_paragraph])
+        for i in range(0, len(sentences), sentences_per_paragraph)
+    ]
+    return '\n\n'.join(paragraphs)
+
+
+def make_text(size, seed=0):
+    """
+    Return a synthetic document of at most `size` characters, ending on a
+    whole sentence. The text for a smaller size is a prefix of the text for
+    a larger one with the same seed.
+    """
+    # Sentences average well over 40 characters, so this always overshoots.
+    document = make_document(size // 40 + 1, seed)
+    end = document.rfind(".", 0, size)
+    return document[:end + 1]
+
+
+def fit_text(text, size):
+    """Repeat or cut `text` to at most `size` characters, ending on a whole sentence where possible."""
+    if not text:
+        return text
+    repeated = (text.strip() + "\n\n") * (size // len(text) + 1)
+    end = repeated.rfind(".", 0, size)
+    return repeated[:end + 1] if end >= 0 else repeated[:size]
@@ -0,0 +1,128 @@
+"""
+Latency and throughput of the HTTP service under concurrent load.
+
+    python -m benchmarks.load_test [--endpoint academic] [--concurrency 32] [--requests 2000]
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 ...
+
+Without --url, a service is started in this process on a free port. Every
+client keeps one connection open and sends its requests back to back.
+Prints requests/s, p50/p99 latency of the answered requests, how many were
+refused with 503, and the service's batching counters.
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.corpus import make_document
+
+PAYLOADS = {
+    "advanced": lambda text, seed: {"text": text, "mode": "Enhanced",
+                                    "techniques": ["punctuation", "formatting"], "seed": seed},
+    "academic": lambda text, seed: {"text": text, "use_passive": True, "use_synonyms": True, "seed": seed},
+    "score": lambda text, seed: {"text": text},
+}
+PATHS = {"advanced": "/humanize/advanced", "academic": "/humanize/academic", "score": "/score"}
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: load-test\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    length = next(int(line.split(":", 1)[1]) for line in head if line.lower().startswith("content-length:"))
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, jobs, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            path, payload = jobs.pop()
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", path, payload)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load(host, port, args):
+    texts = [make_document(args.sentences, seed=i) for i in range(64)]
+    jobs = [
+        (PATHS[args.endpoint], PAYLOADS[args.endpoint](texts[i % len(texts)], i))
+        for i in range(args.requests)
+    ]
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, jobs, latencies, statuses) for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await request(reader, writer, "GET", "/metrics")
+    writer.close()
+    return latencies, statuses, elapsed, metrics
+
+
+def start_local_service(args):
+    """Run a service on a free port in a background thread; return its port."""
+    from transformer.service import Service
+
+    service = Service(workers=args.workers, max_pending=args.max_pending, max_batch=args.max_batch)
+    ready = threading.Event()
+    port = []
+
+    async def run():
+        server = await service.start("127.0.0.1", 0)
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(run()), daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="service to load (default: start one in this process)")
+    parser.add_argument("--endpoint", choices=list(PATHS), default="academic")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=5, help="sentences per request text")
+    parser.add_argument("--workers", type=int, default=4, help="local service only")
+    parser.add_argument("--max-pending", type=int, default=256, help="local service only")
+    parser.add_argument("--max-batch", type=int, default=32, help="local service only")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", start_local_service(args)
+
+    latencies, statuses, elapsed, metrics = asyncio.run(load(host, port, args))
+    latencies.sort()
+
+    def percentile(percent):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))] * 1000 if latencies else 0.0
+
+    print(f"{args.endpoint}: {args.requests} requests, concurrency {args.concurrency}")
+    print(f"  {args.requests / elapsed:9.1f} requests/s")
+    print(f"  p50 {percentile(50):8.1f} ms   p99 {percentile(99):8.1f} ms")
+    print(f"  statuses: {dict(sorted(statuses.items()))}")
+    print(f"  batches: {metrics['batches']}")
+
+
+if __name__ == "__main__":
+    main()
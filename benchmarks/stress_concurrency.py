@@ -0,0 +1,110 @@
+"""
+Humanizers shared across a thread pool: seeded outputs and throughput.
+
+    python -m benchmarks.stress_concurrency [--documents 200] [--max-threads 8]
+        [--workloads advanced academic encode] [--torch-threads 1]
+
+One humanizer instance per engine is shared by every thread. Each document is
+humanized with its own seed, first serially and then with 1, 2, 4... threads, and
+every threaded run must give exactly the serial output; the script fails if
+one does not. Throughput is reported against the single-thread run.
+
+- advanced: AdvancedHumanizer. Pure Python, so it holds the GIL and is not
+  expected to scale; it is here for the output check.
+- academic: AcademicTextHumanizer with passive voice and synonyms. spaCy's
+  parse and the embedding model release the GIL for part of their work.
+  The serial run fills the shared embedding cache, so threaded runs compare
+  against the same vectors.
+- encode: the sentence-transformers model on batches of distinct words,
+  bypassing the cache; this is where threads should scale best. Pass
+  --torch-threads 1 to keep torch's own thread pool from competing with
+  the Python threads.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import make_document, make_sentences
+
+
+def advanced_workload(args):
+    from transformer.humanizer import AdvancedHumanizer
+
+    humanizer = AdvancedHumanizer()
+    texts = [make_document(args.sentences, seed=i) for i in range(args.documents)]
+    techniques = ["typos", "punctuation", "repetition", "formatting"]
+    return [
+        (lambda text=text, seed=seed: humanizer.humanize_text(text, "Enhanced", techniques, seed=seed))
+        for seed, text in enumerate(texts)
+    ]
+
+
+def academic_workload(args):
+    from transformer.app import AcademicTextHumanizer
+
+    humanizer = AcademicTextHumanizer()
+    texts = [make_document(args.sentences, seed=i) for i in range(args.documents)]
+    return [
+        (lambda text=text, seed=seed: humanizer.humanize_text(
+            text, use_passive=True, use_synonyms=True, seed=seed))
+        for seed, text in enumerate(texts)
+    ]
+
+
+def encode_workload(args):
+    from transformer import registry
+
+    model = registry.sentence_transformer()
+    words = sorted({word.strip(".,") for sentence in make_sentences(2000) for word in sentence.split()})
+    batches = [[f"{word} {i}" for word in words[:64]] for i in range(args.documents)]
+    return [
+        (lambda batch=batch: model.encode(batch, convert_to_numpy=True).tolist())
+        for batch in batches
+    ]
+
+
+WORKLOADS = {"advanced": advanced_workload, "academic": academic_workload, "encode": encode_workload}
+
+
+def run(tasks, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(task) for task in tasks]
+        results = [future.result() for future in futures]
+    return results, len(tasks) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=20, help="sentences per document")
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--torch-threads", type=int, help="torch.set_num_threads() before running")
+    args = parser.parse_args()
+
+    if args.torch_threads:
+        import torch
+        torch.set_num_threads(args.torch_threads)
+
+    failed = False
+    for name in args.workloads:
+        tasks = WORKLOADS[name](args)
+        expected = [task() for task in tasks]
+        print(f"{name}: {len(tasks)} tasks")
+        baseline = None
+        threads = 1
+        while threads <= args.max_threads:
+            results, rate = run(tasks, threads)
+            baseline = baseline or rate
+            same = results == expected
+            failed |= not same
+            print(f"  threads={threads:<3} {rate:9.1f} tasks/s  ({rate / baseline:.2f}x)  "
+                  f"{'same output' if same else 'OUTPUT DIFFERS'}")
+            threads *= 2
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
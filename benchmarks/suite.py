@@ -0,0 +1,263 @@
+"""
+Benchmark suite for both humanizer pipelines and the humanness score.
+
+    python -m benchmarks.suite [--sizes 1KB 100KB 1MB] [--combos single] [--academic]
+        [--output results.json] [--baseline baseline.json --threshold 0.15]
+        [--profile DIR [--profiler cprofile|pyinstrument]]
+
+For every corpus size (1KB up to 100MB; synthetic and fixed-seed, or cut
+from --corpus) it measures:
+
+- advanced: humanize_text for every mode and technique combination
+  ("single": none, each technique alone and all four; "all": every subset),
+  plus each stage on its own over the same sentences;
+- score: calculate_humanness_score;
+- academic (with --academic): humanize_text for every combination of
+  use_passive and use_synonyms, split into the parse, the per-sentence
+  transformations and the synonym selection. Sizes above spaCy's
+  max_length are skipped.
+
+Times are the best of --repeat runs, each with seed 0. Peak memory is the
+tracemalloc peak of one extra end-to-end run (skip with --no-memory).
+
+Results are written as JSON with --output. With --baseline, every time and
+peak memory is compared to the same case in an earlier output, and the
+script exits with status 1 if any is more than --threshold (a fraction)
+above it; times under a millisecond are not compared. To store a
+baseline, run once with --output benchmarks/baseline.json on the reference
+machine.
+
+--profile DIR runs every stage once more under cProfile (DIR/<case>/<stage>.prof,
+for snakeviz or flameprof) or pyinstrument (an HTML flamegraph per stage).
+"""
+import argparse
+import cProfile
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from nltk.tokenize import sent_tokenize
+
+from benchmarks.corpus import fit_text, make_text
+from transformer import rules
+from transformer.humanizer import AdvancedHumanizer, calculate_humanness_score
+
+MODES = ["Basic", "Aggressive", "Enhanced"]
+TECHNIQUES = ["typos", "punctuation", "repetition", "formatting"]
+UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20}
+# Times shorter than this are too noisy to flag as regressions.
+MIN_COMPARED_SECONDS = 0.001
+
+
+def parse_size(text):
+    match = re.fullmatch(r"(\d+)\s*([KM]?B)", text.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}; use e.g. 1KB, 10MB")
+    return int(match.group(1)) * UNITS[match.group(2)]
+
+
+def technique_combos(kind):
+    if kind == "all":
+        return [list(combo) for n in range(len(TECHNIQUES) + 1) for combo in itertools.combinations(TECHNIQUES, n)]
+    return [[]] + [[technique] for technique in TECHNIQUES] + [list(TECHNIQUES)]
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def advanced_stages(humanizer, text, sentences, mode, techniques):
+    """Each stage of AdvancedHumanizer on its own, over all `sentences`."""
+    rates = rules.PASS_RATES[mode]
+    stages = {
+        "sent_tokenize": lambda rng: sent_tokenize(text),
+        "expand_contractions": lambda rng: [humanizer._expand_contractions(s) for s in sentences],
+        "transformations": lambda rng: [humanizer._matcher.apply_passes(s, rates, rng) for s in sentences],
+        "natural_flow": lambda rng: [humanizer._add_natural_flow(s, rng) for s in sentences],
+        "vary_structure": lambda rng: [humanizer._vary_structure(s, i, rng) for i, s in enumerate(sentences)],
+        "conversational": lambda rng: [humanizer._add_conversational(s, i, rng) for i, s in enumerate(sentences)],
+        "techniques": lambda rng: [humanizer._apply_techniques(s, techniques, rng) for s in sentences],
+        "fix_punctuation": lambda rng: [humanizer._fix_punctuation(s) for s in sentences],
+    }
+    if not techniques:
+        del stages["techniques"]
+    return {name: (lambda stage=stage: stage(random.Random(0))) for name, stage in stages.items()}
+
+
+def academic_stages(humanizer, text, use_passive, use_synonyms):
+    """Parse, transformations and synonym selection of AcademicTextHumanizer.humanize_text."""
+    doc = humanizer.nlp(text)
+    transformed = humanizer._transform_doc(doc, use_passive, use_synonyms, random.Random(0))
+
+    def finish():
+        # _finish fills in the sentence list it is given.
+        humanizer._finish([(list(transformed[0]), transformed[1])])
+
+    return {
+        "parse": lambda: humanizer.nlp(text),
+        "transform": lambda: humanizer._transform_doc(doc, use_passive, use_synonyms, random.Random(0)),
+        "synonyms": finish,
+    }
+
+
+def profile(stages, directory, profiler):
+    os.makedirs(directory, exist_ok=True)
+    for name, func in stages.items():
+        if profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            session = Profiler()
+            session.start()
+            func()
+            session.stop()
+            with open(os.path.join(directory, f"{name}.html"), "w", encoding="utf-8") as output:
+                output.write(session.output_html())
+        else:
+            session = cProfile.Profile()
+            session.runcall(func)
+            session.dump_stats(os.path.join(directory, f"{name}.prof"))
+
+
+def run_case(results, case, text, end_to_end, stages, args):
+    result = {"bytes": len(text.encode("utf-8"))}
+    result["seconds"] = best_time(end_to_end, args.repeat)
+    result["mb_per_sec"] = result["bytes"] / 1e6 / result["seconds"] if result["seconds"] else 0.0
+    if not args.no_memory:
+        result["peak_mb"] = peak_memory(end_to_end) / 1e6
+    result["stages"] = {name: best_time(func, args.repeat) for name, func in stages.items()}
+    if args.profile:
+        profile(stages, os.path.join(args.profile, case.replace("/", "_")), args.profiler)
+    results[case] = result
+    memory = f" {result['peak_mb']:8.1f} MB peak" if "peak_mb" in result else ""
+    stages_text = "  ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in result["stages"].items())
+    print(f"{case:<52} {result['seconds'] * 1000:10.1f} ms {result['mb_per_sec']:8.2f} MB/s{memory}  [{stages_text}]",
+          file=sys.stderr)
+
+
+def compare(results, baseline, threshold):
+    """Return a line per time or peak memory more than `threshold` above the baseline."""
+    regressions = []
+    for case, result in results.items():
+        old = baseline.get(case)
+        if old is None:
+            continue
+        pairs = [("seconds", result.get("seconds"), old.get("seconds")),
+                 ("peak_mb", result.get("peak_mb"), old.get("peak_mb"))]
+        pairs += [(f"stages.{name}", seconds, old.get("stages", {}).get(name))
+                  for name, seconds in result.get("stages", {}).items()]
+        for metric, new_value, old_value in pairs:
+            if metric != "peak_mb" and (old_value or 0) < MIN_COMPARED_SECONDS:
+                continue
+            if new_value is not None and old_value and new_value > old_value * (1 + threshold):
+                regressions.append(f"{case} {metric}: {old_value:.4g} -> {new_value:.4g} "
+                                   f"(+{new_value / old_value - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[parse_size(s) for s in ["1KB", "100KB", "1MB"]])
+    parser.add_argument("--corpus", help="text file cut or repeated to each size instead of the synthetic corpus")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic corpus")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--combos", choices=["single", "all"], default="single",
+                        help="technique combinations to run for each mode")
+    parser.add_argument("--academic", action="store_true", help="also run AcademicTextHumanizer")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON output of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, as a fraction")
+    parser.add_argument("--profile", metavar="DIR", help="write a profile of every stage here")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8", errors="ignore") as corpus:
+            source = corpus.read()
+        texts = {size: fit_text(source, size) for size in args.sizes}
+    else:
+        texts = {size: make_text(size, args.seed) for size in args.sizes}
+
+    results = {}
+    humanizer = AdvancedHumanizer()
+    academic = None
+    if args.academic:
+        from transformer.app import AcademicTextHumanizer
+        academic = AcademicTextHumanizer()
+
+    for size, text in texts.items():
+        label = next(f"{size // unit}{name}" for name, unit in sorted(UNITS.items(), key=lambda u: -u[1])
+                     if size % unit == 0)
+        sentences = sent_tokenize(text)
+        for mode in args.modes:
+            for techniques in technique_combos(args.combos):
+                case = f"advanced/{label}/{mode}/{'+'.join(techniques) or 'none'}"
+                run_case(
+                    results, case, text,
+                    lambda: humanizer.humanize_text(text, mode, techniques, seed=0),
+                    advanced_stages(humanizer, text, sentences, mode, techniques), args,
+                )
+        run_case(results, f"score/{label}", text, lambda: calculate_humanness_score(text), {}, args)
+
+        if academic is None:
+            continue
+        if len(text) > academic.nlp.max_length:
+            print(f"academic/{label}: skipped, longer than spaCy's max_length ({academic.nlp.max_length})",
+                  file=sys.stderr)
+            continue
+        for use_passive, use_synonyms in itertools.product([False, True], repeat=2):
+            case = f"academic/{label}/passive={use_passive}/synonyms={use_synonyms}"
+            run_case(
+                results, case, text,
+                lambda: academic.humanize_text(text, use_passive, use_synonyms, seed=0),
+                academic_stages(academic, text, use_passive, use_synonyms), args,
+            )
+
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "corpus": args.corpus or f"synthetic seed={args.seed}",
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(output, handle, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle)["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        print(f"{len(regressions)} regressions above {args.threshold:.0%}", file=sys.stderr)
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
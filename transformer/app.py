@@ -1,21 +1,44 @@
 import ssl
+import time
 import random
 import warnings
 
-import nltk
-import spacy
-from nltk.tokenize import word_tokenize
-from nltk.corpus import wordnet
-from sentence_transformers import SentenceTransformer, util
+from transformer import registry, resources
+from transformer.instrumentation import Run
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-NLP_GLOBAL = spacy.load("en_core_web_sm")
+ACADEMIC_RESOURCES = ['punkt', 'averaged_perceptron_tagger', 'punkt_tab', 'wordnet', 'averaged_perceptron_tagger_eng']
+
+# Part of every cached academic result's key (see transformer.cache): bump it
+# whenever AcademicTextHumanizer's transformations change, so that results
+# produced by older logic are not served again.
+ACADEMIC_VERSION = "1"
+
+# Endings of spaCy/NLTK contraction tokens ("n't", "'re", ...) and their expansions.
+TOKEN_CONTRACTIONS = {
+    "n't": " not", "'re": " are", "'s": " is", "'ll": " will",
+    "'ve": " have", "'d": " would", "'m": " am"
+}
+
+# NLTK, spaCy and sentence-transformers (torch) are imported on first use so
+# that importing this module stays cheap and never loads a model.
+
+
+def __getattr__(name):
+    # NLP_GLOBAL used to be loaded at import time; it is now loaded on first access.
+    if name == "NLP_GLOBAL":
+        return registry.spacy_pipeline("en_core_web_sm")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def download_nltk_resources():
     """
     Download required NLTK resources if not already installed.
     """
+    if not resources.ensure_resources(ACADEMIC_RESOURCES):
+        return []
+
     try:
         _create_unverified_https_context = ssl._create_unverified_context
     except AttributeError:
@@ -23,12 +46,10 @@ def download_nltk_resources():
     else:
         ssl._create_default_https_context = _create_unverified_https_context
 
-    resources = ['punkt', 'averaged_perceptron_tagger', 'punkt_tab','wordnet','averaged_perceptron_tagger_eng']
-    for resource in resources:
-        try:
-            nltk.download(resource, quiet=True)
-        except Exception as e:
-            print(f"Error downloading {resource}: {str(e)}")
+    missing = resources.ensure_resources(ACADEMIC_RESOURCES, download=True)
+    for resource in missing:
+        print(f"Error downloading {resource}")
+    return missing
 
 
 # This class  contains methods to humanize academic text, such as improving readability or
@@ -40,6 +61,11 @@ class AcademicTextHumanizer:
       - Adds academic transitions
       - Optionally converts some sentences to passive voice
       - Optionally replaces words with synonyms for more formality
+
+    An instance holds no per-call state and may be shared between threads:
+    each call draws from its own random.Random, and the shared resources
+    (spaCy pipeline, embedding cache, synonym index) are safe for concurrent
+    use.
     """
 
     def __init__(
@@ -48,13 +74,49 @@ class AcademicTextHumanizer:
         p_passive=0.2,
         p_synonym_replacement=0.3,
         p_academic_transition=0.3,
-        seed=None
+        seed=None,
+        embedding_cache_dir=None,
+        synonym_index_path=None,
+        cache=None,
+        synonym_table_path=None,
+        embedding_backend="torch",
+        observer=None
     ):
-        if seed is not None:
-            random.seed(seed)
+        # Default seed of calls that pass neither `seed` nor `rng`.
+        # humanize_text and humanize_many draw from their own random.Random
+        # and never seed or use the global random module.
+        self.seed = seed
+        self.model_name = model_name
+        self.embedding_backend = embedding_backend
+        # Optional transformer.cache.ResultCache; only seeded calls use it.
+        self.cache = cache
+        # Optional default observer of every call; see transformer.instrumentation.
+        self.observer = observer
 
-        self.nlp = spacy.load("en_core_web_sm")
-        self.model = SentenceTransformer(model_name)
+        # Shared with every other humanizer in the process. Named entities
+        # are never used, so the NER component is not loaded.
+        self.nlp = registry.spacy_pipeline("en_core_web_sm", exclude=("ner",))
+        if synonym_table_path:
+            # Lightweight mode: synonym choices come from the table built by
+            # python -m transformer.similarity, and the embedding model (and
+            # torch) is never loaded.
+            self.synonym_table = registry.similarity_table(synonym_table_path)
+            if self.synonym_table.model_name != model_name:
+                raise ValueError(
+                    f"{synonym_table_path} was built with {self.synonym_table.model_name!r}, not {model_name!r}"
+                )
+            self.model = None
+            self.embeddings = None
+        else:
+            self.synonym_table = None
+            # "torch", "int8" or "onnx"; see transformer.backends.
+            self.model = registry.sentence_transformer(model_name, embedding_backend)
+            # Word embeddings are cached per model and backend; pass
+            # embedding_cache_dir to also keep them on disk across processes.
+            self.embeddings = registry.embedding_cache(model_name, embedding_cache_dir, embedding_backend)
+        # Synonyms come from the precomputed index (python -m transformer.synonyms)
+        # when it has been built, and from live WordNet queries otherwise.
+        self.synonym_index = registry.synonym_index(synonym_index_path)
 
         # Transformation probabilities
         self.p_passive = p_passive
@@ -67,124 +129,333 @@ class AcademicTextHumanizer:
             "Therefore,", "Consequently,", "Nonetheless,", "Nevertheless,"
         ]
 
-    def humanize_text(self, text, use_passive=False, use_synonyms=False):
-        doc = self.nlp(text)
+    def humanize_text(self, text, use_passive=False, use_synonyms=False, seed=None, rng=None, observer=None):
+        """
+        Random choices come from `rng` if given, else from a new
+        random.Random(seed) (seed defaults to the constructor's), so a seeded
+        call is reproducible. Seeded calls are looked up in and added to
+        `self.cache` when there is one.
+
+        `observer` (default `self.observer`), if set, is called with the
+        transformer.instrumentation.Run of the call. Calls answered from the
+        cache are not observed.
+        """
+        if rng is not None:
+            # An explicit generator makes the call unrepeatable, so it is never cached.
+            return self._humanize_parsed([(text, use_passive, use_synonyms, rng)], observer)[0]
+        return self.humanize_each([(text, use_passive, use_synonyms, seed)], observer)[0]
+
+    def humanize_each(self, requests, observer=None):
+        """
+        humanize_text(text, use_passive, use_synonyms, seed) for each tuple of
+        `requests`, returned as a list. The texts not found in the cache are
+        parsed in one nlp.pipe pass and their synonyms chosen in one batch
+        (so one model encode), and each output equals the one humanize_text
+        gives for that request alone. `observer` gets a single Run for the
+        texts not answered from the cache.
+        """
+        requests = [
+            (text, use_passive, use_synonyms, self.seed if seed is None else seed)
+            for text, use_passive, use_synonyms, seed in requests
+        ]
+        outputs = [None] * len(requests)
+        keys = {}
+        if self.cache is not None:
+            for i, (text, use_passive, use_synonyms, seed) in enumerate(requests):
+                if seed is not None:
+                    keys[i] = self._cache_key(text, use_passive, use_synonyms, seed)
+                    outputs[i] = self.cache.get(keys[i])
+
+        todo = [i for i, output in enumerate(outputs) if output is None]
+        if todo:
+            parsed = self._humanize_parsed([
+                (text, use_passive, use_synonyms, random.Random(seed))
+                for text, use_passive, use_synonyms, seed in (requests[i] for i in todo)
+            ], observer)
+            for i, output in zip(todo, parsed):
+                outputs[i] = output
+                if i in keys:
+                    self.cache.put(keys[i], output)
+        return outputs
+
+    def _humanize_parsed(self, items, observer=None):
+        """Outputs for (text, use_passive, use_synonyms, rng) items: one parse pass, one synonym selection."""
+        if observer is None:
+            observer = self.observer
+        run = Run("academic") if observer is not None else None
+
+        docs = self.nlp.pipe([text for text, _, _, _ in items], batch_size=len(items))
+        if run is not None:
+            docs = run.timed("parse", docs, _count_sentences)
+        transformed = [
+            self._transform_doc(doc, use_passive, use_synonyms, rng, run)
+            for doc, (_, use_passive, use_synonyms, rng) in zip(docs, items)
+        ]
+        outputs = self._finish(transformed, run)
+        if run is not None:
+            run.finish(observer)
+        return outputs
+
+    def _cache_key(self, text, use_passive, use_synonyms, seed):
+        # Table lookups (for word forms the table does not hold) and other
+        # backends can choose differently from the torch model, so their
+        # outputs are kept apart.
+        if self.synonym_table is not None:
+            model = self.model_name + "+table"
+        elif self.embedding_backend != "torch":
+            model = f"{self.model_name}+{self.embedding_backend}"
+        else:
+            model = self.model_name
+        return self.cache.key(
+            text, "academic", ACADEMIC_VERSION, model, self.p_passive, self.p_synonym_replacement,
+            self.p_academic_transition, use_passive, use_synonyms, seed,
+        )
+
+    def humanize_many(self, texts, use_passive=False, use_synonyms=False,
+                      batch_size=64, n_process=1, seeds=None, observer=None):
+        """
+        Humanize an iterable of texts, yielding the results in order.
+
+        Texts are parsed with nlp.pipe (in `n_process` processes) and the
+        synonyms of each `batch_size` documents are chosen in one batch. With
+        `seeds`, the result for texts[i] is humanize_text(texts[i],
+        seed=seeds[i]), whatever the batch size and number of processes;
+        without, all documents draw from one random.Random(self.seed).
+        `observer` is called with a single Run for all texts once the last
+        result has been yielded.
+        """
+        if observer is None:
+            observer = self.observer
+        run = Run("academic") if observer is not None else None
+
+        seeds = iter(seeds) if seeds is not None else None
+        rng = random.Random(self.seed)
+        pending = []
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        if run is not None:
+            docs = run.timed("parse", docs, _count_sentences)
+        for doc in docs:
+            if seeds is not None:
+                rng = random.Random(next(seeds))
+            pending.append(self._transform_doc(doc, use_passive, use_synonyms, rng, run))
+            if len(pending) >= batch_size:
+                yield from self._finish(pending, run)
+                pending = []
+        yield from self._finish(pending, run)
+        if run is not None:
+            run.finish(observer)
+
+    def _transform_doc(self, doc, use_passive, use_synonyms, rng, run=None):
+        """
+        Transform a parsed document, returning (sentences, synonym_plans);
+        the planned synonym replacements are applied by _finish.
+
+        Each step works on the (text, tag) pairs of the sentence's tokens and
+        reuses the parse's dependency labels, instead of re-tokenizing,
+        re-tagging or re-parsing the sentence string. With a
+        transformer.instrumentation.Run, each step is timed into it.
+        """
         transformed_sentences = []
+        synonym_plans = []
 
         for sent in doc.sents:
-            sentence_str = sent.text.strip()
+            tokens = [token for token in sent if not token.is_space]
+            if not tokens:
+                continue
+            if run is not None:
+                run.sentences += 1
+                clock = time.perf_counter()
 
             # 1. Expand contractions
-            sentence_str = self.expand_contractions(sentence_str)
+            tagged = [(self._expand_contraction(token.text).strip(), token.tag_) for token in tokens]
+            if run is not None:
+                expanded = any(word != token.text for (word, _), token in zip(tagged, tokens))
+                clock = run.lap("expand_contractions", clock, int(expanded))
 
             # 2. Possibly add academic transitions
-            if random.random() < self.p_academic_transition:
-                sentence_str = self.add_academic_transitions(sentence_str)
+            if rng.random() < self.p_academic_transition:
+                # Kept as one token ("Moreover,") so that the text reads as
+                # before; it is not a synonym candidate.
+                tagged = [(rng.choice(self.academic_transitions), "RB")] + tagged
+            if run is not None:
+                clock = run.lap("transitions", clock, int(len(tagged) > len(tokens)))
 
             # 3. Optionally convert to passive
-            if use_passive and random.random() < self.p_passive:
-                sentence_str = self.convert_to_passive(sentence_str)
+            if use_passive:
+                rewritten = tagged
+                if rng.random() < self.p_passive:
+                    rewritten = self._tagged_to_passive(tokens, tagged)
+                if run is not None:
+                    clock = run.lap("passive", clock, int(rewritten is not tagged))
+                tagged = rewritten
+
+            # 4. Optionally replace words with synonyms (chosen in _finish, in
+            #    one batch for all pending documents)
+            if use_synonyms:
+                if rng.random() < self.p_synonym_replacement:
+                    synonym_plans.append((len(transformed_sentences), self._plan_tagged(tagged, rng)))
+                if run is not None:
+                    run.lap("synonym_plan", clock)
 
-            # 4. Optionally replace words with synonyms
-            if use_synonyms and random.random() < self.p_synonym_replacement:
-                sentence_str = self.replace_with_synonyms(sentence_str)
+            transformed_sentences.append(' '.join(word for word, _ in tagged))
 
-            transformed_sentences.append(sentence_str)
+        return transformed_sentences, synonym_plans
 
-        return ' '.join(transformed_sentences)
+    def _finish(self, transformed, run=None):
+        """Apply the synonym plans of several _transform_doc results at once and join each document."""
+        plans = [plan for _, synonym_plans in transformed for _, plan in synonym_plans]
+        start = time.perf_counter()
+        resolved = self._resolve_synonyms(plans)
+        if run is not None and plans:
+            changed = sum(sentence != ' '.join(tokens) for (tokens, _), sentence in zip(plans, resolved))
+            run.add("synonyms", time.perf_counter() - start, sentences=len(plans), replacements=changed)
+        resolved = iter(resolved)
+        results = []
+        for sentences, synonym_plans in transformed:
+            for position, _ in synonym_plans:
+                sentences[position] = next(resolved)
+            results.append(' '.join(sentences))
+        return results
 
     def expand_contractions(self, sentence):
-        contraction_map = {
-            "n't": " not", "'re": " are", "'s": " is", "'ll": " will",
-            "'ve": " have", "'d": " would", "'m": " am"
-        }
-        tokens = word_tokenize(sentence)
-        expanded_tokens = []
-        for token in tokens:
-            lower_token = token.lower()
-            replaced = False
-            for contraction, expansion in contraction_map.items():
-                if contraction in lower_token and lower_token.endswith(contraction):
-                    new_token = lower_token.replace(contraction, expansion)
-                    if token[0].isupper():
-                        new_token = new_token.capitalize()
-                    expanded_tokens.append(new_token)
-                    replaced = True
-                    break
-            if not replaced:
-                expanded_tokens.append(token)
-
-        return ' '.join(expanded_tokens)
-
-    def add_academic_transitions(self, sentence):
-        transition = random.choice(self.academic_transitions)
+        from nltk.tokenize import word_tokenize
+
+        return ' '.join(self._expand_contraction(token) for token in word_tokenize(sentence))
+
+    def _expand_contraction(self, token):
+        if "'" not in token:
+            # Every contraction has an apostrophe; most tokens have none.
+            return token
+        lower_token = token.lower()
+        for contraction, expansion in TOKEN_CONTRACTIONS.items():
+            if contraction in lower_token and lower_token.endswith(contraction):
+                new_token = lower_token.replace(contraction, expansion)
+                if token[0].isupper():
+                    new_token = new_token.capitalize()
+                return new_token
+        return token
+
+    def add_academic_transitions(self, sentence, rng=random):
+        transition = rng.choice(self.academic_transitions)
         return f"{transition} {sentence}"
 
     def convert_to_passive(self, sentence):
         doc = self.nlp(sentence)
-        subj_tokens = [t for t in doc if t.dep_ == 'nsubj' and t.head.dep_ == 'ROOT']
-        dobj_tokens = [t for t in doc if t.dep_ == 'dobj']
+        parts = self._passive_parts(doc)
+        if parts:
+            subject, verb, dobj = parts
+            passive_str = f"{dobj.text} {verb.lemma_} by {subject.text}"
+            original_str = ' '.join(token.text for token in doc)
+            chunk = f"{subject.text} {verb.text} {dobj.text}"
+            if chunk in original_str:
+                sentence = original_str.replace(chunk, passive_str)
+        return sentence
+
+    def _tagged_to_passive(self, tokens, tagged):
+        """
+        convert_to_passive() for an already parsed sentence: `tagged` holds
+        the (text, tag) pairs of `tokens`, possibly after a transition.
+        """
+        parts = self._passive_parts(tokens)
+        if not parts:
+            return tagged
+        subject, verb, dobj = parts
+        first = tokens.index(subject)
+        if tokens.index(verb) != first + 1 or tokens.index(dobj) != first + 2:
+            return tagged
+        start = len(tagged) - len(tokens) + first
+        (subject_text, subject_tag), _, (dobj_text, dobj_tag) = tagged[start:start + 3]
+        passive = [(dobj_text, dobj_tag), (verb.lemma_, "VB"), ("by", "IN"), (subject_text, subject_tag)]
+        return tagged[:start] + passive + tagged[start + 3:]
+
+    def _passive_parts(self, tokens):
+        """Return (subject, verb, direct object) of the root clause, in that order, or None."""
+        subj_tokens = [t for t in tokens if t.dep_ == 'nsubj' and t.head.dep_ == 'ROOT']
+        dobj_tokens = [t for t in tokens if t.dep_ == 'dobj']
 
         if subj_tokens and dobj_tokens:
             subject = subj_tokens[0]
             dobj = dobj_tokens[0]
             verb = subject.head
             if subject.i < verb.i < dobj.i:
-                passive_str = f"{dobj.text} {verb.lemma_} by {subject.text}"
-                original_str = ' '.join(token.text for token in doc)
-                chunk = f"{subject.text} {verb.text} {dobj.text}"
-                if chunk in original_str:
-                    sentence = original_str.replace(chunk, passive_str)
-        return sentence
+                return subject, verb, dobj
+        return None
+
+    def replace_with_synonyms(self, sentence, rng=random):
+        return self._resolve_synonyms([self._plan_synonyms(sentence, rng)])[0]
 
-    def replace_with_synonyms(self, sentence):
-        tokens = word_tokenize(sentence)
-        pos_tags = nltk.pos_tag(tokens)
+    def _plan_synonyms(self, sentence, rng=random):
+        """
+        Tokenize `sentence` and decide which words to replace, returning
+        (tokens, [(token_index, word, tag, synonyms), ...]). Choosing among the
+        synonyms is left to _resolve_synonyms so that it can be batched.
+        """
+        import nltk
+        from nltk.tokenize import word_tokenize
 
-        new_tokens = []
-        for (word, pos) in pos_tags:
-            if pos.startswith(('J', 'N', 'V', 'R')) and wordnet.synsets(word):
-                if random.random() < 0.5:
+        return self._plan_tagged(nltk.pos_tag(word_tokenize(sentence)), rng)
+
+    def _plan_tagged(self, tagged, rng=random):
+        """_plan_synonyms for a sentence given as (text, Penn Treebank tag) pairs."""
+        candidates = []
+        for i, (word, pos) in enumerate(tagged):
+            if pos.startswith(('J', 'N', 'V', 'R')) and self._in_wordnet(word):
+                if rng.random() < 0.5:
                     synonyms = self._get_synonyms(word, pos)
                     if synonyms:
-                        best_synonym = self._select_closest_synonym(word, synonyms)
-                        new_tokens.append(best_synonym if best_synonym else word)
-                    else:
-                        new_tokens.append(word)
-                else:
-                    new_tokens.append(word)
-            else:
-                new_tokens.append(word)
+                        candidates.append((i, word, pos, synonyms))
+        return [word for word, _ in tagged], candidates
+
+    def _resolve_synonyms(self, plans):
+        """
+        Apply a batch of plans from _plan_synonyms and return the new
+        sentences. All words and synonyms of the batch are embedded in one
+        lookup and scored together, or looked up in the similarity table.
+        """
+        candidates = [candidate for _, candidates in plans for candidate in candidates]
+        if self.synonym_table is not None:
+            from transformer.synonyms import wordnet_pos
+
+            choices = iter([self.synonym_table.closest(word, wordnet_pos(pos)) for _, word, pos, _ in candidates])
+        else:
+            from transformer.embeddings import closest_synonyms
+
+            choices = iter(closest_synonyms(
+                self.embeddings, [(word, synonyms) for _, word, _, synonyms in candidates],
+            ))
+        sentences = []
+        for tokens, candidates in plans:
+            new_tokens = list(tokens)
+            for i, _, _, _ in candidates:
+                best_synonym = next(choices)
+                if best_synonym:
+                    new_tokens[i] = best_synonym
+            sentences.append(' '.join(new_tokens))
+        return sentences
+
+    def _in_wordnet(self, word):
+        if self.synonym_index is not None:
+            return self.synonym_index.known(word)
+        from transformer.synonyms import wordnet_known
 
-        return ' '.join(new_tokens)
+        return wordnet_known(word)
 
     def _get_synonyms(self, word, pos):
-        wn_pos = None
-        if pos.startswith('J'):
-            wn_pos = wordnet.ADJ
-        elif pos.startswith('N'):
-            wn_pos = wordnet.NOUN
-        elif pos.startswith('R'):
-            wn_pos = wordnet.ADV
-        elif pos.startswith('V'):
-            wn_pos = wordnet.VERB
-
-        synonyms = set()
-        for syn in wordnet.synsets(word, pos=wn_pos):
-            for lemma in syn.lemmas():
-                lemma_name = lemma.name().replace('_', ' ')
-                if lemma_name.lower() != word.lower():
-                    synonyms.add(lemma_name)
-        return list(synonyms)
+        from transformer.synonyms import wordnet_pos, wordnet_synonyms
+
+        if self.synonym_index is not None:
+            return self.synonym_index.synonyms(word, wordnet_pos(pos))
+        return wordnet_synonyms(word, wordnet_pos(pos))
 
     def _select_closest_synonym(self, original_word, synonyms):
         if not synonyms:
             return None
-        original_emb = self.model.encode(original_word, convert_to_tensor=True)
-        synonym_embs = self.model.encode(synonyms, convert_to_tensor=True)
-        cos_scores = util.cos_sim(original_emb, synonym_embs)[0]
-        max_score_index = cos_scores.argmax().item()
-        max_score = cos_scores[max_score_index].item()
-        if max_score >= 0.5:
-            return synonyms[max_score_index]
-        return None
\ No newline at end of file
+        if self.synonym_table is not None:
+            return self.synonym_table.closest_among(original_word, synonyms)
+        from transformer.embeddings import closest_synonyms
+
+        return closest_synonyms(self.embeddings, [(original_word, synonyms)])[0]
+
+
+def _count_sentences(doc):
+    return sum(1 for _ in doc.sents)
@@ -0,0 +1,69 @@
+"""
+Embedding backends for the academic humanizer's synonym selection.
+
+A backend is any object with SentenceTransformer's
+encode(sentences, convert_to_numpy=True) method; EmbeddingCache only ever
+calls that. Backends are created by name through the registry, so every
+humanizer in a process shares one instance per (model, backend):
+
+- "torch": the full-precision SentenceTransformer (the default).
+- "int8": the same model with its Linear layers dynamically quantized to
+  int8 by torch. Smaller and usually faster on CPU; the embeddings, and so
+  a few synonym choices, differ slightly.
+- "onnx": the model exported to ONNX and run by ONNX Runtime, through
+  sentence-transformers' ONNX backend. Needs `pip install
+  optimum[onnxruntime]`; the export happens on first load and is cached by
+  sentence-transformers.
+
+Other backends can be added with register_backend().
+"""
+
+DEFAULT_BACKEND = "torch"
+
+
+def _load_torch(model_name):
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _load_int8(model_name):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # A separate copy: quantizing the shared full-precision model would
+    # change the torch backend too.
+    model = SentenceTransformer(model_name, device="cpu")
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(model_name):
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        return SentenceTransformer(model_name, backend="onnx")
+    except ImportError as error:
+        raise ImportError(
+            "the onnx embedding backend needs ONNX Runtime: pip install optimum[onnxruntime]"
+        ) from error
+
+
+_loaders = {"torch": _load_torch, "int8": _load_int8, "onnx": _load_onnx}
+
+
+def register_backend(name, loader):
+    """Make `name` selectable as an embedding backend; `loader(model_name)` returns the backend."""
+    _loaders[name] = loader
+
+
+def backend_names():
+    return list(_loaders)
+
+
+def load_backend(model_name, backend=DEFAULT_BACKEND):
+    """A new instance of `backend` for `model_name`. Use registry.sentence_transformer() to share one."""
+    try:
+        loader = _loaders[backend]
+    except KeyError:
+        raise ValueError(f"unknown embedding backend {backend!r}; choose one of {backend_names()}") from None
+    return loader(model_name)
@@ -0,0 +1,109 @@
+"""
+Content-addressed cache of humanized outputs.
+
+An entry is keyed by a SHA-256 digest of the input text together with every
+option that affects the output (engine, mode, techniques, seed, rules
+version), so only seeded, fully reproducible calls can use it. Entries live in
+an in-memory LRU bounded by the total length of the outputs it holds
+(`max_chars`) and, when `cache_dir` is given, also as one file each on disk,
+where later processes find them. Outputs longer than the whole budget are
+only kept on disk.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    def __init__(self, max_chars=16_000_000, cache_dir=None):
+        self.max_chars = max_chars
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        # Total length of the outputs in _memory.
+        self._chars = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(text, *options):
+        """Digest of `text` and the JSON-serializable `options`."""
+        digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached output for `key`, or None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            value = self._read(key)
+            if value is not None:
+                self._remember(key, value)
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._write(key, value)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+            "chars": self._chars,
+        }
+
+    def _remember(self, key, value):
+        if len(value) > self.max_chars:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._chars -= len(old)
+        self._memory[key] = value
+        self._chars += len(value)
+        while self._chars > self.max_chars:
+            _, evicted = self._memory.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def _read(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8", newline="") as entry:
+                return entry.read()
+        except OSError:
+            return None
+
+    def _write(self, key, value):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(partial, "w", encoding="utf-8", newline="") as entry:
+                entry.write(value)
+            # Readers in other processes see either no entry or a whole one.
+            os.replace(partial, path)
+        except OSError:
+            pass  # read-only or full disk: the in-memory tier still works
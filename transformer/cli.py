@@ -0,0 +1,270 @@
+"""
+Command-line entry point for bulk humanization.
+
+    python -m transformer notes.txt "drafts/*.txt" corpus/ --mode Aggressive -t punctuation
+    cat essay.txt | python -m transformer --engine academic --synonyms > out.txt
+
+Files are written next to their inputs as <name>.humanized<ext>, or into
+--output-dir, keeping their path below the directory (or the fixed part of
+the glob) they were found through. The NLTK data the engine needs is checked
+once before any file is touched; missing data is an error unless
+--download-resources is given. Streamlit is never imported, and the academic
+engine (spaCy and sentence-transformers) is only loaded when it is selected.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TECHNIQUES = ["typos", "punctuation", "repetition", "formatting"]
+MODES = ["Basic", "Aggressive", "Enhanced"]
+CHUNK_SIZE = 1 << 20
+
+_engine = None
+
+
+def build_parser():
+    from transformer.similarity import default_table_path
+
+    parser = argparse.ArgumentParser(
+        prog="python -m transformer",
+        description="Humanize text files, directories or stdin.",
+    )
+    parser.add_argument("inputs", nargs="*",
+                        help="files, glob patterns or directories; '-' or nothing reads stdin")
+    parser.add_argument("--engine", choices=["advanced", "academic"], default="advanced")
+    parser.add_argument("--mode", choices=MODES, default="Enhanced",
+                        help="number of transformation passes (advanced engine)")
+    parser.add_argument("-t", "--technique", action="append", choices=TECHNIQUES, default=[],
+                        dest="techniques", help="additional technique, repeatable (advanced engine)")
+    parser.add_argument("--passive", action="store_true", help="convert some sentences to passive (academic engine)")
+    parser.add_argument("--synonyms", action="store_true", help="replace words with synonyms (academic engine)")
+    parser.add_argument("--synonym-table", nargs="?", const=default_table_path(),
+                        help="choose synonyms from the precomputed similarity table instead of "
+                             "loading the embedding model (academic engine)")
+    parser.add_argument("--embedding-backend", choices=["torch", "int8", "onnx"], default="torch",
+                        help="how the embedding model is run (academic engine)")
+    parser.add_argument("--seed", type=int, default=None, help="seed applied to every input for reproducible output")
+    parser.add_argument("--cache-dir", help="reuse outputs of earlier seeded runs stored here (needs --seed; "
+                                            "inputs are then read whole instead of streamed)")
+    parser.add_argument("-o", "--output-dir", help="write outputs here instead of next to the inputs")
+    parser.add_argument("--suffix", default=".humanized", help="inserted before the output file extension")
+    parser.add_argument("--pattern", default="*.txt", help="file pattern used inside directories")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--download-resources", action="store_true",
+                        help="download missing NLTK data instead of exiting")
+    return parser
+
+
+def collect_inputs(inputs, pattern, suffix):
+    """
+    Expand files, globs and directories into a sorted, de-duplicated list of
+    (file, root) pairs, where `root` is the directory the file was found
+    through. Earlier outputs (names ending in `suffix`) found through a glob
+    or directory are skipped; files named explicitly are always kept.
+    """
+    found_in = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            root, found = item, glob.glob(os.path.join(item, "**", pattern), recursive=True)
+        elif glob.has_magic(item):
+            root, found = _glob_root(item), glob.glob(item, recursive=True)
+        else:
+            found_in.setdefault(os.path.normpath(item), os.path.dirname(item))
+            continue
+        for path in found:
+            if os.path.isfile(path) and not (suffix and os.path.splitext(path)[0].endswith(suffix)):
+                found_in.setdefault(os.path.normpath(path), root)
+    return sorted(found_in.items())
+
+
+def _glob_root(pattern):
+    """The leading directories of `pattern` that contain no wildcards."""
+    parts = []
+    for part in os.path.dirname(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts)
+
+
+def output_path(path, root, output_dir, suffix):
+    """Where the output of `path`, found through `root`, is written."""
+    name, ext = os.path.splitext(path)
+    if output_dir:
+        name = os.path.join(output_dir, os.path.relpath(name, root or os.curdir))
+    return f"{name}{suffix}{ext or '.txt'}"
+
+
+def _file_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def required_resources(engine):
+    """NLTK data the `engine` needs (see transformer.resources)."""
+    if engine == "academic":
+        from transformer.app import ACADEMIC_RESOURCES
+        return ACADEMIC_RESOURCES
+    from transformer.segmenter import PUNKT_RESOURCES
+    return PUNKT_RESOURCES
+
+
+def _init_engine(options):
+    from transformer import registry
+
+    global _engine
+    cache = registry.result_cache(options["cache_dir"]) if options["cache_dir"] else None
+    if options["engine"] == "academic":
+        from transformer.app import AcademicTextHumanizer
+        _engine = AcademicTextHumanizer(
+            cache=cache, synonym_table_path=options["synonym_table"],
+            embedding_backend=options["embedding_backend"],
+        )
+    else:
+        from transformer.humanizer import AdvancedHumanizer
+        _engine = AdvancedHumanizer(cache=cache)
+
+
+def _read_chunks(handle):
+    while True:
+        chunk = handle.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _humanize_handle(source, target, options):
+    """Humanize everything readable from `source` into `target`."""
+    if options["engine"] == "academic":
+        target.write(_engine.humanize_text(
+            source.read(),
+            use_passive=options["passive"],
+            use_synonyms=options["synonyms"],
+            seed=options["seed"],
+        ))
+    elif options["cache_dir"] and options["seed"] is not None:
+        # Cached results are looked up by the whole text.
+        target.write(_engine.humanize_text(
+            source.read(), options["mode"], options["techniques"], seed=options["seed"],
+        ))
+    else:
+        for piece in _engine.humanize_stream(
+            _read_chunks(source), options["mode"], options["techniques"], seed=options["seed"],
+        ):
+            target.write(piece)
+    target.write("\n")
+
+
+def _process_file(path, destination, options):
+    start = time.perf_counter()
+    # Written next to the destination and renamed on success, so a failed
+    # file leaves no empty or partial output behind.
+    partial = f"{destination}.{os.getpid()}.tmp"
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as source, \
+                open(partial, "w", encoding="utf-8") as target:
+            _humanize_handle(source, target, options)
+        os.replace(partial, destination)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return os.path.getsize(path), time.perf_counter() - start
+
+
+def _process_file_in_worker(path, destination, options):
+    if _engine is None:
+        _init_engine(options)
+    return _process_file(path, destination, options)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.suffix and not args.output_dir:
+        parser.error("an empty --suffix needs --output-dir, or outputs would overwrite their inputs")
+    options = {
+        "engine": args.engine,
+        "mode": args.mode,
+        "techniques": args.techniques,
+        "passive": args.passive,
+        "synonyms": args.synonyms,
+        "seed": args.seed,
+        "cache_dir": args.cache_dir,
+        "synonym_table": args.synonym_table,
+        "embedding_backend": args.embedding_backend,
+    }
+
+    from transformer import resources
+    missing = resources.ensure_resources(required_resources(args.engine), download=args.download_resources)
+    if missing:
+        print(f"error: missing NLTK data: {', '.join(missing)}; install it with nltk.download() "
+              f"or rerun with --download-resources", file=sys.stderr)
+        return 2
+
+    if not args.inputs or args.inputs == ["-"]:
+        _init_engine(options)
+        _humanize_handle(sys.stdin, sys.stdout, options)
+        return 0
+
+    inputs = collect_inputs(args.inputs, args.pattern, args.suffix)
+    if not inputs:
+        print("error: no input files matched", file=sys.stderr)
+        return 2
+    jobs = {path: output_path(path, root, args.output_dir, args.suffix) for path, root in inputs}
+    inputs_at = {_file_key(path): path for path in jobs}
+    outputs_at = {}
+    for path, destination in jobs.items():
+        key = _file_key(destination)
+        if key in inputs_at or key in outputs_at:
+            other = f"input {inputs_at[key]}" if key in inputs_at else f"the output of {outputs_at[key]}"
+            print(f"error: the output of {path} ({destination}) would overwrite {other}", file=sys.stderr)
+            return 2
+        outputs_at[key] = path
+    for directory in {os.path.dirname(destination) for destination in jobs.values()}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    done_bytes = 0
+    failures = 0
+
+    def report(path, result=None, error=None):
+        nonlocal done_bytes, failures
+        if error is not None:
+            failures += 1
+            print(f"FAILED {path}: {error}", file=sys.stderr)
+        else:
+            done_bytes += result[0]
+            print(f"{path} -> {jobs[path]} ({result[1]:.2f}s)", file=sys.stderr)
+
+    if args.workers <= 1 or len(jobs) == 1:
+        _init_engine(options)
+        for path, destination in jobs.items():
+            try:
+                report(path, _process_file(path, destination, options))
+            except Exception as error:
+                report(path, error=error)
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as executor:
+            futures = {
+                executor.submit(_process_file_in_worker, path, destination, options): path
+                for path, destination in jobs.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    report(futures[future], future.result())
+                except Exception as error:
+                    report(futures[future], error=error)
+
+    elapsed = time.perf_counter() - start
+    succeeded = len(jobs) - failures
+    print(
+        f"{succeeded}/{len(jobs)} files, {done_bytes / 1e6:.2f} MB in {elapsed:.2f}s "
+        f"({succeeded / elapsed if elapsed else 0:.1f} files/s, "
+        f"{done_bytes / 1e6 / elapsed if elapsed else 0:.2f} MB/s)",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
@@ -0,0 +1,226 @@
+"""
+Word-embedding cache for the academic humanizer's synonym selection.
+
+Embeddings are served from an in-memory LRU first, then from an optional
+on-disk store (one directory per model, vectors in a memory-mapped float32
+file), and only the words found in neither are sent to the model, in a single
+encode call. Lookups take a list of words and return one matrix, so
+closest_synonyms() can score a whole sentence's (or document's) candidates
+with batched matrix products.
+
+EmbeddingCache is safe to share between threads.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked across processes
+    fcntl = None
+
+
+class EmbeddingCache:
+    def __init__(self, model, model_name, max_entries=50_000, cache_dir=None):
+        self.model = model
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._warm = False
+        self._warm_lock = threading.Lock()
+        self._store = DiskStore(cache_dir, model_name) if cache_dir else None
+
+    def encode(self, words):
+        """Return a (len(words), dim) float32 matrix of embeddings for `words`."""
+        with self._lock:
+            found = {}
+            for word in dict.fromkeys(words):
+                vector = self._memory.get(word)
+                if vector is not None:
+                    self._memory.move_to_end(word)
+                    found[word] = vector
+                    self.hits += 1
+
+            pending = [word for word in dict.fromkeys(words) if word not in found]
+            if pending and self._store is not None:
+                for word, vector in self._store.get_many(pending).items():
+                    found[word] = vector
+                    self._remember(word, vector)
+                    self.disk_hits += 1
+                pending = [word for word in pending if word not in found]
+
+        if pending:
+            # The model runs outside the lock, so that threads sharing the
+            # cache encode concurrently (torch releases the GIL while it
+            # computes). Two threads missing the same word both encode it.
+            vectors = np.asarray(self._encode(pending), dtype=np.float32)
+            with self._lock:
+                self.misses += len(pending)
+                for word, vector in zip(pending, vectors):
+                    found[word] = vector
+                    self._remember(word, vector)
+                if self._store is not None:
+                    self._store.append(pending, vectors)
+
+        return np.stack([found[word] for word in words])
+
+    def _encode(self, words):
+        if not self._warm:
+            # The first call sets up the model's tokenizer (padding and
+            # truncation), which must not race with other calls.
+            with self._warm_lock:
+                if not self._warm:
+                    vectors = self.model.encode(words, convert_to_numpy=True)
+                    self._warm = True
+                    return vectors
+        return self.model.encode(words, convert_to_numpy=True)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+            "disk_entries": len(self._store) if self._store is not None else 0,
+        }
+
+    def _remember(self, word, vector):
+        self._memory[word] = vector
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def closest_synonyms(cache, candidates, threshold=0.5, block_size=512):
+    """
+    For each (word, synonyms) pair in `candidates`, return the synonym whose
+    embedding has the highest cosine similarity with the word's, or None if
+    that similarity is below `threshold`. Ties go to the earlier synonym.
+    """
+    return [
+        synonym if score >= threshold else None
+        for synonym, score in best_synonyms(cache, candidates, block_size)
+    ]
+
+
+def best_synonyms(cache, candidates, block_size=512):
+    """
+    For each (word, synonyms) pair in `candidates`, return (synonym, cosine
+    similarity) for the synonym closest to the word, whatever the similarity.
+
+    Every distinct word is embedded once, in a single cache lookup; synonym
+    lists are padded to a common width so each block of candidates is scored
+    with one batched matrix product.
+    """
+    if not candidates:
+        return []
+
+    vocabulary = list(dict.fromkeys(
+        word for original, synonyms in candidates for word in (original, *synonyms)
+    ))
+    index = {word: i for i, word in enumerate(vocabulary)}
+    vectors = cache.encode(vocabulary)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+
+    width = max(len(synonyms) for _, synonyms in candidates)
+    padded = np.full((len(candidates), width), -1, dtype=np.intp)
+    for row, (_, synonyms) in enumerate(candidates):
+        padded[row, :len(synonyms)] = [index[word] for word in synonyms]
+    originals = np.array([index[original] for original, _ in candidates], dtype=np.intp)
+
+    best = np.empty(len(candidates), dtype=np.intp)
+    best_scores = np.empty(len(candidates), dtype=np.float32)
+    for start in range(0, len(candidates), block_size):
+        rows = slice(start, start + block_size)
+        block = padded[rows]
+        # (block, width, dim) x (block, dim) -> (block, width)
+        scores = np.einsum("bwd,bd->bw", vectors[np.maximum(block, 0)], vectors[originals[rows]])
+        scores[block < 0] = -np.inf
+        best[rows] = scores.argmax(axis=1)
+        best_scores[rows] = scores[np.arange(len(block)), best[rows]]
+
+    return [
+        (synonyms[choice], float(score))
+        for (_, synonyms), choice, score in zip(candidates, best, best_scores)
+    ]
+
+
+class DiskStore:
+    """
+    Append-only embedding store for one model: `words.txt` holds one word per
+    line, `vectors.f32` the matching rows, read through np.memmap.
+    """
+
+    def __init__(self, cache_dir, model_name):
+        self.directory = os.path.join(cache_dir, re.sub(r"[^\w.-]+", "_", model_name))
+        os.makedirs(self.directory, exist_ok=True)
+        self._words_path = os.path.join(self.directory, "words.txt")
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self.dim = None
+        self._index = {}
+        self._vectors = None
+        self._load()
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_many(self, words):
+        rows = {word: self._index[word] for word in words if word in self._index}
+        if not rows:
+            return {}
+        needed = max(rows.values()) + 1
+        if self._vectors is None or len(self._vectors) < needed:
+            available = os.path.getsize(self._vectors_path) // (4 * self.dim)
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(available, self.dim)
+            )
+        vectors = self._vectors[list(rows.values())]
+        return dict(zip(rows, vectors))
+
+    def append(self, words, vectors):
+        new = [(word, vector) for word, vector in zip(words, vectors)
+               if "\n" not in word and word not in self._index]
+        if not new:
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with open(self._meta_path, "w", encoding="utf-8") as meta:
+                json.dump({"dim": self.dim}, meta)
+        rows = np.stack([vector for _, vector in new]).astype(np.float32)
+        with open(self._vectors_path, "ab") as vectors_file, \
+                open(self._words_path, "a", encoding="utf-8", newline="\n") as words_file:
+            # Both files are appended under one lock so that line i of
+            # words.txt always describes row i of vectors.f32, even with
+            # several processes sharing the store.
+            if fcntl is not None:
+                fcntl.flock(vectors_file, fcntl.LOCK_EX)
+            start = os.fstat(vectors_file.fileno()).st_size // (4 * self.dim)
+            vectors_file.write(rows.tobytes())
+            vectors_file.flush()
+            words_file.write("".join(word + "\n" for word, _ in new))
+            words_file.flush()
+        for i, (word, _) in enumerate(new):
+            self._index.setdefault(word, start + i)
+
+    def _load(self):
+        try:
+            with open(self._meta_path, encoding="utf-8") as meta:
+                self.dim = json.load(meta)["dim"]
+            with open(self._words_path, encoding="utf-8", newline="\n") as words_file:
+                words = words_file.read().split("\n")[:-1]
+        except (OSError, ValueError, KeyError):
+            return
+        rows = min(len(words), os.path.getsize(self._vectors_path) // (4 * self.dim))
+        self._index = {}
+        for i, word in enumerate(words[:rows]):
+            self._index.setdefault(word, i)
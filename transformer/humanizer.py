@@ -0,0 +1,264 @@
+import hashlib
+import random
+import time
+
+from transformer import rules
+from transformer.instrumentation import Run
+from transformer.phrases import PhraseMatcher
+
+
+class AdvancedHumanizer:
+    """
+    Advanced AI Humanizer with multiple techniques
+
+    Instances are safe to share between threads: the rules and matcher are
+    read-only, and each call draws from its own random.Random.
+    """
+    
+    def __init__(self, transformations: dict = None, cache=None, observer=None, segmenter: str = "punkt"):
+        # The default table and its matcher are compiled once per process.
+        if transformations is None:
+            self.transformations = rules.TRANSFORMATIONS
+            self._matcher = rules.TRANSFORMATION_MATCHER
+            self._rules_version = rules.RULES_VERSION
+        else:
+            self.transformations = transformations
+            self._matcher = PhraseMatcher(transformations)
+            table = repr(sorted(transformations.items())).encode("utf-8")
+            self._rules_version = f"{rules.RULES_VERSION}+{hashlib.sha256(table).hexdigest()[:16]}"
+        # Optional transformer.cache.ResultCache; only seeded calls use it.
+        self.cache = cache
+        # Optional default observer of every call; see transformer.instrumentation.
+        self.observer = observer
+        # Sentence splitter: NLTK's "punkt", or the faster rule-based "regex"
+        # (see transformer.segmenter).
+        self.segmenter = segmenter
+    
+    def _fix_punctuation(self, text: str) -> str:
+        """Fix spacing around punctuation"""
+        text = rules.SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+        text = rules.MISSING_SPACE_AFTER_PUNCTUATION.sub(r'\1 \2', text)
+        text = rules.SPACE_AROUND_APOSTROPHE.sub("'", text)
+        text = rules.WHITESPACE_RUN.sub(' ', text)
+        return text.strip()
+    
+    def humanize_text(self, text: str, mode: str = "Enhanced", techniques: list = None,
+                      progress=None, seed: int = None, rng: random.Random = None, observer=None) -> str:
+        """
+        Main humanization function
+        
+        `progress`, if given, is called as progress(done, total) after each
+        sentence is processed.
+        
+        Random choices are drawn from `rng` if given, else from a new
+        random.Random(seed), never from the global random module: the same
+        text, options and seed always give the same output. Seeded calls are
+        looked up in and added to `self.cache` when there is one.
+        
+        `observer` (default `self.observer`), if set, is called with the
+        transformer.instrumentation.Run of the call. Calls answered from the
+        cache are not observed.
+        """
+        key = None
+        if self.cache is not None and seed is not None and rng is None:
+            # The splitters can disagree, so their outputs are kept apart.
+            version = self._rules_version if self.segmenter == "punkt" else f"{self._rules_version}+{self.segmenter}"
+            key = self.cache.key(text, "advanced", version, mode, sorted(techniques or []), seed)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if observer is None:
+            observer = self.observer
+        run = Run("advanced") if observer is not None else None
+        
+        start = time.perf_counter()
+        sentences = _sent_tokenize(text, self.segmenter)
+        if run is not None:
+            run.add("sent_tokenize", time.perf_counter() - start, sentences=len(sentences))
+        output = " ".join(self._humanize_sentences(
+            sentences, mode, techniques, _make_rng(seed, rng), progress, len(sentences), run
+        ))
+        if run is not None:
+            run.finish(observer)
+        if key is not None:
+            self.cache.put(key, output)
+        return output
+    
+    def humanize_stream(self, chunks, mode: str = "Enhanced", techniques: list = None,
+                        max_buffer: int = 1_000_000, seed: int = None, rng: random.Random = None,
+                        observer=None):
+        """
+        Humanize text arriving as an iterable of string chunks.
+        
+        Only text up to the last sentence boundary seen so far is processed;
+        the trailing, possibly unfinished sentence stays buffered until more
+        text arrives. A buffer that grows past `max_buffer` characters without
+        a boundary is flushed as it is, so memory stays bounded. Yields output
+        pieces whose concatenation equals humanize_text on the joined input
+        (with the same seed). `observer` is called once the stream ends; its
+        Run has no sent_tokenize stage, as splitting waits on the input.
+        """
+        if observer is None:
+            observer = self.observer
+        run = Run("advanced") if observer is not None else None
+        sentences = self._stream_sentences(chunks, max_buffer)
+        for i, sentence in enumerate(self._humanize_sentences(
+            sentences, mode, techniques, _make_rng(seed, rng), run=run
+        )):
+            yield sentence if i == 0 else " " + sentence
+        if run is not None:
+            run.finish(observer)
+    
+    def _stream_sentences(self, chunks, max_buffer: int):
+        """Split a stream of chunks into complete sentences"""
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            sentences = _sent_tokenize(buffer, self.segmenter)
+            # At the end of the text a final "?!" or "!!" is split into two
+            # sentences; hold both back, as more text may follow.
+            keep = 2 if len(sentences) > 1 and not sentences[-1].strip("?!") else 1
+            if len(sentences) > keep:
+                yield from sentences[:-keep]
+                # Keep the tail verbatim: it may continue in the next chunk.
+                buffer = buffer[buffer.rindex(sentences[-keep]):]
+            elif len(buffer) > max_buffer:
+                yield from sentences
+                buffer = ""
+        yield from _sent_tokenize(buffer, self.segmenter)
+    
+    def _humanize_sentences(self, sentences, mode: str, techniques: list, rng: random.Random,
+                            progress=None, total: int = None, run: Run = None):
+        """Run every stage on each sentence in turn"""
+        if techniques is None:
+            techniques = []
+        
+        stages = self._stages(rules.PASS_RATES.get(mode, rules.PASS_RATES["Enhanced"]), techniques, rng)
+        for i, sentence in enumerate(sentences):
+            if run is None:
+                for _, stage in stages:
+                    sentence = stage(sentence, i)
+            else:
+                run.sentences += 1
+                for name, stage in stages:
+                    start = time.perf_counter()
+                    new_sentence = stage(sentence, i)
+                    run.add(name, time.perf_counter() - start, replacements=int(new_sentence != sentence))
+                    sentence = new_sentence
+            if progress is not None:
+                progress(i + 1, total)
+            if sentence:
+                yield sentence
+    
+    def _stages(self, pass_rates: tuple, techniques: list, rng: random.Random):
+        """The (name, stage(sentence, position)) pipeline every sentence runs through, in order"""
+        stages = [
+            ("expand_contractions", lambda sentence, i: self._expand_contractions(sentence)),
+            # Multiple transformation passes, run from a single scan
+            ("transformations", lambda sentence, i: self._matcher.apply_passes(sentence, pass_rates, rng)),
+            ("natural_flow", lambda sentence, i: self._add_natural_flow(sentence, rng)),
+            ("vary_structure", lambda sentence, i: self._vary_structure(sentence, i, rng)),
+            ("conversational", lambda sentence, i: self._add_conversational(sentence, i, rng)),
+        ]
+        if techniques:
+            stages.append(("techniques", lambda sentence, i: self._apply_techniques(sentence, techniques, rng)))
+        stages.append(("fix_punctuation", lambda sentence, i: self._fix_punctuation(sentence)))
+        return stages
+    
+    def _expand_contractions(self, text: str) -> str:
+        """Expand contractions"""
+        return rules.CONTRACTION_PATTERN.sub(rules.expand_contraction, text)
+    
+    def _apply_transformations(self, sentence: str, pass_num: int, rng=random) -> str:
+        """Apply synonym transformations"""
+        replacement_rate = 0.999 - (pass_num * 0.01)
+        return self._matcher.apply(sentence, replacement_rate, rng)
+    
+    def _add_natural_flow(self, sentence: str, rng=random) -> str:
+        """Add natural conversational flow"""
+        for formal, casuals in rules.FORMAL_TO_CASUAL.items():
+            if sentence.startswith(formal):
+                if rng.random() < 0.7:
+                    sentence = sentence.replace(formal, rng.choice(casuals), 1)
+        
+        return sentence
+    
+    def _vary_structure(self, sentence: str, position: int, rng=random) -> str:
+        """Vary sentence structure"""
+        if rng.random() < 0.80 and len(sentence.split()) > 10:
+            parts = sentence.split('. ')
+            if len(parts) >= 2:
+                connector = rng.choice(rules.STRUCTURE_CONNECTORS)
+                sentence = f"{parts[0]}{connector} {parts[1][0].lower()}{parts[1][1:]}"
+                if len(parts) > 2:
+                    sentence += ". " + ". ".join(parts[2:])
+        
+        return sentence
+    
+    def _add_conversational(self, sentence: str, position: int, rng=random) -> str:
+        """Add conversational elements"""
+        if position > 0 and rng.random() < 0.25:
+            if not sentence.startswith(rules.NO_STARTER_PREFIXES):
+                sentence = f"{rng.choice(rules.STARTERS)} {sentence[0].lower()}{sentence[1:]}"
+        
+        if rng.random() < 0.15:
+            pattern, replacement = rng.choice(rules.EMPHASIS)
+            sentence = pattern.sub(replacement, sentence, count=1)
+        
+        return sentence
+    
+    def _apply_techniques(self, sentence: str, techniques: list, rng=random) -> str:
+        """Apply additional humanization techniques to one sentence"""
+        # Typos
+        if "typos" in techniques and rng.random() < 0.2:
+            words = sentence.split()
+            for j in range(len(words)):
+                if words[j].lower() in rules.COMMON_TYPOS and rng.random() < 0.3:
+                    words[j] = rng.choice(rules.COMMON_TYPOS[words[j].lower()])
+            sentence = ' '.join(words)
+        
+        # Punctuation variation
+        if "punctuation" in techniques and rng.random() < 0.15:
+            if sentence.endswith('.'):
+                sentence = sentence[:-1] + '..'
+        
+        # Repetition
+        if "repetition" in techniques and rng.random() < 0.1:
+            words = sentence.split()
+            if len(words) > 4:
+                idx = rng.randint(0, len(words) - 1)
+                if len(words[idx]) > 3:
+                    words.insert(idx + 1, words[idx])
+                    sentence = ' '.join(words)
+        
+        # Formatting
+        if "formatting" in techniques and rng.random() < 0.08:
+            words = sentence.split()
+            if len(words) > 3:
+                idx = rng.randint(0, len(words) - 1)
+                if len(words[idx]) > 3:
+                    words[idx] = f"*{words[idx]}*"
+                    sentence = ' '.join(words)
+        
+        return sentence
+
+
+def _make_rng(seed=None, rng=None) -> random.Random:
+    """The generator for one call: `rng` itself, or a new one seeded with `seed`."""
+    return rng if rng is not None else random.Random(seed)
+
+
+def _sent_tokenize(text: str, segmenter: str = "punkt") -> list:
+    # NLTK takes a few hundred milliseconds to import, so it is only imported
+    # (by transformer.segmenter) on first use of Punkt
+    from transformer.segmenter import sent_tokenize
+    return sent_tokenize(text, segmenter)
+
+
+def calculate_humanness_score(text: str, segmenter: str = "punkt") -> tuple:
+    """Calculate humanness score and metrics"""
+    # Single-document case of the bulk scorer; NumPy is imported on first use.
+    from transformer.scoring import score_text
+
+    return score_text(text, segmenter)
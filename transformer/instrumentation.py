@@ -0,0 +1,149 @@
+"""
+Opt-in per-stage instrumentation of the humanizers.
+
+Both humanizers take an `observer`, in their constructor or per call: a
+callable that receives, at the end of every humanize call, the Run holding
+what each stage of that call cost. Without an observer the humanizers take
+their usual path and nothing is timed.
+
+Per stage a Run records:
+
+- seconds: time spent in the stage;
+- calls: how many times it ran (once per sentence for sentence stages,
+  once per document for parsing and tokenizing);
+- sentences: sentences it ran on (or produced, for the tokenizer and parser);
+- replacements: sentences it changed.
+
+Stages of AdvancedHumanizer: sent_tokenize, expand_contractions,
+transformations (every pass, applied in one scan), natural_flow,
+vary_structure, conversational, techniques and fix_punctuation. Stages of
+AcademicTextHumanizer: parse, expand_contractions, transitions, passive,
+synonym_plan and synonyms (the batched synonym choice).
+
+StageRecorder is an observer keeping running totals and the last run;
+prometheus_text() renders its totals in the Prometheus text format.
+"""
+import threading
+import time
+
+STAGE_FIELDS = ("seconds", "calls", "sentences", "replacements")
+
+
+class Run:
+    """Stage statistics of one humanize call."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        # stage -> {"seconds", "calls", "sentences", "replacements"}, in the order the stages first ran.
+        self.stages = {}
+        self.sentences = 0
+        self.seconds = 0.0
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds, calls=1, sentences=1, replacements=0):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = dict.fromkeys(STAGE_FIELDS, 0)
+        stage["seconds"] += seconds
+        stage["calls"] += calls
+        stage["sentences"] += sentences
+        stage["replacements"] += replacements
+
+    def lap(self, name, start, replacements=0):
+        """Add the time since `start` to one sentence's `name` stage and return the current time."""
+        now = time.perf_counter()
+        self.add(name, now - start, replacements=replacements)
+        return now
+
+    def timed(self, name, iterable, sentences=None):
+        """
+        Iterate over `iterable`, adding the time taken to produce each item
+        to stage `name`; `sentences(item)` gives the item's sentence count.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add(name, time.perf_counter() - start, sentences=sentences(item) if sentences else 1)
+            yield item
+
+    def finish(self, observer):
+        self.seconds = time.perf_counter() - self._start
+        observer(self)
+
+    def breakdown(self):
+        """One row per stage, with its share of the run's time."""
+        return [
+            dict(stage=name, share=stage["seconds"] / self.seconds if self.seconds else 0.0, **stage)
+            for name, stage in self.stages.items()
+        ]
+
+
+class StageRecorder:
+    """
+    Observer adding up every run per engine and stage, and keeping the last
+    run. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.last = None
+        self._runs = {}
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, run):
+        with self._lock:
+            self.last = run
+            totals = self._runs.setdefault(run.engine, {"runs": 0, "seconds": 0.0, "sentences": 0})
+            totals["runs"] += 1
+            totals["seconds"] += run.seconds
+            totals["sentences"] += run.sentences
+            for name, stage in run.stages.items():
+                stage_totals = self._stages.setdefault((run.engine, name), dict.fromkeys(STAGE_FIELDS, 0))
+                for field in STAGE_FIELDS:
+                    stage_totals[field] += stage[field]
+
+    def totals(self):
+        """({engine: run totals}, {(engine, stage): stage totals}), copied."""
+        with self._lock:
+            return (
+                {engine: dict(totals) for engine, totals in self._runs.items()},
+                {key: dict(totals) for key, totals in self._stages.items()},
+            )
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_RUN_METRICS = [
+    ("runs", "humanizer_runs_total", "Humanize calls observed."),
+    ("seconds", "humanizer_run_seconds_total", "Time spent in observed humanize calls."),
+    ("sentences", "humanizer_run_sentences_total", "Sentences processed by observed humanize calls."),
+]
+_STAGE_METRICS = [
+    ("seconds", "humanizer_stage_seconds_total", "Time spent in each stage."),
+    ("calls", "humanizer_stage_calls_total", "Times each stage ran."),
+    ("sentences", "humanizer_stage_sentences_total", "Sentences each stage ran on."),
+    ("replacements", "humanizer_stage_replacements_total", "Sentences each stage changed."),
+]
+
+
+def prometheus_text(recorder):
+    """The totals of a StageRecorder in the Prometheus text exposition format."""
+    runs, stages = recorder.totals()
+    lines = []
+    for field, metric, description in _RUN_METRICS:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+        for engine, totals in sorted(runs.items()):
+            lines.append(f'{metric}{{engine="{_label(engine)}"}} {totals[field]}')
+    for field, metric, description in _STAGE_METRICS:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+        for (engine, name), totals in sorted(stages.items()):
+            lines.append(f'{metric}{{engine="{_label(engine)}",stage="{_label(name)}"}} {totals[field]}')
+    return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,166 @@
+import random
+import re
+
+
+class PhraseMatcher:
+    """
+    Precompiled matcher for a phrase -> replacements table.
+
+    All phrases are folded into a single alternation, factored as a character
+    trie, that is tried at every position of the lowercased sentence, so one
+    left-to-right scan finds every occurrence of every phrase. Phrases are
+    applied longest (in words) first, as the original per-phrase loop did.
+    """
+
+    def __init__(self, transformations):
+        # Same ordering as the original per-call sort: most words first,
+        # table order among equals.
+        self.phrases = sorted(
+            transformations,
+            key=lambda phrase: len(phrase.split()),
+            reverse=True
+        )
+        self.options = [list(transformations[phrase]) for phrase in self.phrases]
+        self._index = {phrase.lower(): i for i, phrase in enumerate(self.phrases)}
+
+        # The trie is greedy, so it reports the longest phrase starting at a
+        # given position; shorter phrases that are a prefix of it are
+        # recovered through _prefixes.
+        pattern = '(?=(' + trie_pattern(self._index) + '))'
+        self._pattern = re.compile(pattern)
+        # Fallback for the rare text whose lowercase form changes length.
+        self._pattern_ci = re.compile(pattern, re.IGNORECASE)
+        self._prefixes = {
+            i: [
+                j for j, other in enumerate(self.phrases)
+                if j != i and len(other) < len(phrase)
+                and phrase.lower().startswith(other.lower())
+            ]
+            for i, phrase in enumerate(self.phrases)
+        }
+
+        # A replacement can complete a phrase that reaches this far past
+        # either of its edges ("particularly across" -> "particularly in").
+        self._reach = max((len(phrase) for phrase in self.phrases), default=0)
+
+    def scan(self, sentence):
+        """
+        Return every occurrence as [start, end, phrase_index, bounded], sorted
+        by start. `bounded` tells whether the occurrence sits on word
+        boundaries (the only ones that get replaced); unbounded substring hits
+        are kept because they still count as the phrase being present.
+        """
+        lowered = sentence.lower()
+        if len(lowered) == len(sentence):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._pattern_ci.finditer(sentence)
+
+        occurrences = []
+        for match in matches:
+            start = match.start()
+            i = self._index[match.group(1).lower()]
+            for j in [i] + self._prefixes[i]:
+                end = start + len(self.phrases[j])
+                occurrences.append([start, end, j, _is_bounded(sentence, start, end)])
+        return occurrences
+
+    def apply(self, sentence, rate, rng=random):
+        """Run a single transformation pass over `sentence`."""
+        return self.apply_passes(sentence, (rate,), rng)
+
+    def apply_passes(self, sentence, rates, rng=random):
+        """
+        Run one transformation pass per entry of `rates` over `sentence`.
+
+        In every pass, each phrase that is present is replaced with that
+        pass's probability, at its first word-bounded occurrence only, keeping
+        the capitalisation of the first letter. The sentence is scanned once;
+        later passes work on the occurrence table, which is patched as text is
+        replaced, including phrases that a replacement itself introduces (for
+        example "encompasses" -> "includes") or completes with the words
+        around it ("particularly across many" -> "particularly in many").
+        Random draws happen in the same
+        order as re-running a phrase-by-phrase loop once per pass would make
+        them, so seeded output is identical.
+        """
+        occurrences = self.scan(sentence)
+        for rate in rates:
+            if not occurrences:
+                break
+            i = -1
+            while True:
+                i = min((occ[2] for occ in occurrences if occ[2] > i), default=None)
+                if i is None:
+                    break
+                if rng.random() >= rate:
+                    continue
+                replacement = rng.choice(self.options[i])
+                target = next((occ for occ in occurrences if occ[2] == i and occ[3]), None)
+                if target is not None:
+                    sentence, occurrences = self._replace(
+                        sentence, occurrences, target, replacement
+                    )
+        return sentence
+
+    def _replace(self, sentence, occurrences, target, replacement):
+        start, end = target[0], target[1]
+        text = replacement
+        if sentence[start].isupper():
+            text = replacement[0].upper() + replacement[1:]
+        shift = len(text) - (end - start)
+        sentence = sentence[:start] + text + sentence[end:]
+        new_end = end + shift
+
+        # Occurrences overlapping or touching the replaced span may be gone or
+        # change their word boundaries; everything else is kept as it was.
+        patched = []
+        for occ in occurrences:
+            if occ[1] < start:
+                patched.append(occ)
+            elif occ[0] > end:
+                patched.append([occ[0] + shift, occ[1] + shift, occ[2], occ[3]])
+        # Phrases now overlapping or touching the replacement, including ones
+        # that straddle its edges, all lie within one phrase length of it.
+        offset = max(0, start - self._reach)
+        window = sentence[offset:new_end + self._reach]
+        for s, e, j, _ in self.scan(window):
+            s, e = s + offset, e + offset
+            if e >= start and s <= new_end:
+                patched.append([s, e, j, _is_bounded(sentence, s, e)])
+        patched.sort()
+        return sentence, patched
+
+
+def trie_pattern(words):
+    """Regex alternation matching any of `words`, factored as a character trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node):
+    branches = [
+        re.escape(char) + _trie_node_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    return '(?:' + body + ')?' if '' in node else body
+
+
+def _is_bounded(text, start, end):
+    return (
+        (start == 0 or not _is_word_char(text[start - 1]))
+        and (end == len(text) or not _is_word_char(text[end]))
+    )
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
@@ -0,0 +1,106 @@
+"""
+Process-wide registry of heavy resources (spaCy pipeline, SentenceTransformer
+models and their embedding caches, the WordNet synonym index, synonym
+similarity tables, result caches).
+
+Each resource is loaded the first time it is asked for and then shared by
+every humanizer in the process. Load time and the resident-memory growth seen
+while loading are recorded per resource and available from resource_metrics().
+"""
+import os
+import threading
+import time
+
+_resources = {}
+_metrics = {}
+# Re-entrant: some loaders fetch other resources (embedding caches need their model).
+_lock = threading.RLock()
+
+
+def get_resource(key, loader):
+    """Return the resource stored under `key`, calling `loader()` the first time."""
+    try:
+        return _resources[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _resources:
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            _resources[key] = loader()
+            rss_after = _rss_bytes()
+            _metrics[key] = {
+                "load_seconds": time.perf_counter() - start,
+                "rss_delta_bytes": (
+                    rss_after - rss_before
+                    if rss_before is not None and rss_after is not None else None
+                ),
+            }
+        return _resources[key]
+
+
+def spacy_pipeline(name="en_core_web_sm", exclude=()):
+    """The spaCy pipeline `name`, loaded without the components in `exclude`."""
+    def load():
+        import spacy
+        return spacy.load(name, exclude=list(exclude))
+    key = ("spacy", name, "exclude=" + ",".join(exclude) if exclude else "")
+    return get_resource(key, load)
+
+
+def sentence_transformer(model_name="paraphrase-MiniLM-L6-v2", backend="torch"):
+    """The embedding model `model_name` run by `backend` (see transformer.backends)."""
+    def load():
+        from transformer.backends import load_backend
+        return load_backend(model_name, backend)
+    return get_resource(("sentence_transformer", model_name, "" if backend == "torch" else backend), load)
+
+
+def embedding_cache(model_name="paraphrase-MiniLM-L6-v2", cache_dir=None, backend="torch"):
+    def load():
+        from transformer.embeddings import EmbeddingCache
+        # Backends give slightly different vectors, so each keeps its own disk store.
+        store_name = model_name if backend == "torch" else f"{model_name}-{backend}"
+        return EmbeddingCache(sentence_transformer(model_name, backend), store_name, cache_dir=cache_dir)
+    return get_resource(
+        ("embedding_cache", model_name, "" if backend == "torch" else backend, cache_dir or ""), load
+    )
+
+
+def synonym_index(path=None):
+    """The precomputed synonym index at `path` (default location if None), or None if it has not been built."""
+    def load():
+        from transformer.synonyms import SynonymIndex, default_index_path
+        index_path = path or default_index_path()
+        return SynonymIndex(index_path) if os.path.exists(index_path) else None
+    return get_resource(("synonym_index", path or ""), load)
+
+
+def similarity_table(path):
+    """The precomputed synonym-similarity table at `path`."""
+    def load():
+        from transformer.similarity import SimilarityTable
+        return SimilarityTable(path)
+    return get_resource(("similarity_table", path), load)
+
+
+def result_cache(cache_dir=None):
+    """The process-wide cache of humanized outputs, optionally backed by `cache_dir`."""
+    def load():
+        from transformer.cache import ResultCache
+        return ResultCache(cache_dir=cache_dir)
+    return get_resource(("result_cache", cache_dir or ""), load)
+
+
+def resource_metrics():
+    """Return {name: {"load_seconds": ..., "rss_delta_bytes": ...}} for loaded resources."""
+    with _lock:
+        return {":".join(part for part in key if part): dict(metrics) for key, metrics in _metrics.items()}
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,154 @@
+"""
+Explicit checks for the NLTK data the humanizers need.
+
+Nothing here runs at import time, and nothing touches the network unless
+ensure_resources() is called with download=True.
+
+Every resource is looked up under its own NLTK category (tokenizers/,
+taggers/, corpora/). Once found, its location is remembered for the rest of
+the process and written to a small marker file, so later processes only have
+to confirm that the recorded paths still exist instead of searching every
+NLTK data directory. A pre-seeded offline data directory can be passed as
+`data_dir` or through the HUMANIZER_NLTK_DATA environment variable.
+"""
+import json
+import os
+import sys
+import time
+
+# NLTK data path (category/name) of every resource used by the humanizers.
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+    "averaged_perceptron_tagger_eng": "taggers/averaged_perceptron_tagger_eng",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+    "stopwords": "corpora/stopwords",
+}
+
+MARKER_NAME = "humanizer-nltk-resources.json"
+
+# name -> path on disk, for resources confirmed present in this process
+_verified = {}
+# name -> {"status": ..., "seconds": ..., "path": ...} for the last check of each resource
+_report = {}
+
+
+def default_cache_dir():
+    return os.environ.get(
+        "HUMANIZER_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "humanizer"),
+    )
+
+
+def use_data_dir(data_dir):
+    """Put an NLTK data directory first on NLTK's search path."""
+    data_dir = os.path.abspath(data_dir)
+    if "nltk" in sys.modules:
+        import nltk
+        if data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, data_dir)
+    else:
+        # Read by NLTK when it is first imported.
+        paths = [p for p in os.environ.get("NLTK_DATA", "").split(os.pathsep) if p]
+        if data_dir not in paths:
+            os.environ["NLTK_DATA"] = os.pathsep.join([data_dir] + paths)
+
+
+def missing_resources(names=None, data_dir=None):
+    """Return the names among `names` (default: all) that are not installed locally."""
+    data_dir = data_dir or os.environ.get("HUMANIZER_NLTK_DATA")
+    if data_dir:
+        use_data_dir(data_dir)
+    names = list(names or NLTK_RESOURCES)
+
+    pending = [name for name in names if name not in _verified]
+    if not pending:
+        return []
+
+    marker_path = os.path.join(data_dir or default_cache_dir(), MARKER_NAME)
+    marker = _read_marker(marker_path)
+    missing = []
+    for name in pending:
+        start = time.perf_counter()
+        path = marker.get(name)
+        if path and os.path.exists(path):
+            status = "marker"
+        else:
+            path = _find(name)
+            status = "found" if path else "missing"
+        _report[name] = {"status": status, "seconds": time.perf_counter() - start, "path": path}
+        if path:
+            _verified[name] = path
+        else:
+            missing.append(name)
+
+    if any(_report[name]["status"] == "found" for name in pending):
+        _write_marker(marker_path, {**marker, **_verified})
+    return missing
+
+
+def ensure_resources(names=None, download=False, data_dir=None):
+    """
+    Check that NLTK resources are installed and return the ones still missing.
+
+    Missing resources are only downloaded when `download` is true, into
+    `data_dir` if one is given.
+    """
+    missing = missing_resources(names, data_dir)
+    if not missing or not download:
+        return missing
+
+    import nltk
+
+    download_seconds = {}
+    for name in missing:
+        start = time.perf_counter()
+        try:
+            nltk.download(name, download_dir=data_dir, quiet=True)
+        except Exception as e:
+            print(f"Error downloading {name}: {str(e)}")
+        download_seconds[name] = time.perf_counter() - start
+    still_missing = missing_resources(missing, data_dir)
+    for name in missing:
+        _report[name]["seconds"] += download_seconds[name]
+        if name not in still_missing:
+            _report[name]["status"] = "downloaded"
+    return still_missing
+
+
+def resource_report():
+    """Return {name: {"status", "seconds", "path"}} for every resource checked so far."""
+    return {name: dict(entry) for name, entry in _report.items()}
+
+
+def _find(name):
+    import nltk
+
+    # Corpora such as wordnet are often installed only as a zip archive.
+    for resource in (NLTK_RESOURCES[name], NLTK_RESOURCES[name] + ".zip"):
+        try:
+            pointer = nltk.data.find(resource)
+        except LookupError:
+            continue
+        # Resources inside an archive resolve to the archive itself.
+        return getattr(pointer, "path", None) or pointer.zipfile.filename
+    return None
+
+
+def _read_marker(path):
+    try:
+        with open(path, encoding="utf-8") as marker:
+            return json.load(marker)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_marker(path, found):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as marker:
+            json.dump(found, marker, indent=2)
+    except OSError:
+        pass  # read-only location: fall back to checking every process
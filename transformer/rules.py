@@ -0,0 +1,104 @@
+"""
+Rule tables used by AdvancedHumanizer, compiled once at import time.
+
+The humanizer's per-sentence methods only read the objects below; nothing in
+here is rebuilt per call.
+"""
+import re
+
+from transformer.phrases import PhraseMatcher, trie_pattern
+
+# Part of every cached result's key (see transformer.cache): bump it whenever a
+# table below or the humanizers' use of them changes, so that results produced
+# by older rules are not served again.
+RULES_VERSION = "1"
+
+TRANSFORMATIONS = {
+    # Core transformations
+    "refers to": ["talks about", "is about", "means", "points to", "signifies"],
+    "holds": ["has", "carries", "possesses"],
+    "includes": ["covers", "involves", "contains"],
+    "ensures": ["makes sure", "guarantees", "sees to it"],
+    "reveals": ["shows", "uncovers", "demonstrates"],
+    "encompasses": ["includes", "covers", "takes in"],
+
+    # Descriptive words
+    "basic": ["fundamental", "core", "primary"],
+    "strong": ["powerful", "solid", "robust"],
+    "various": ["different", "several", "multiple"],
+    "current": ["present", "existing", "today's"],
+    "concerning": ["worrying", "troubling", "alarming"],
+    "common": ["usual", "typical", "frequent"],
+    "poor": ["bad", "inadequate", "substandard"],
+
+    # Connectors
+    "Besides": ["Moreover", "What's more", "Also", "Plus"],
+    "Additionally": ["Moreover", "Also", "What's more"],
+    "Furthermore": ["Moreover", "Also", "Plus"],
+    "However": ["But", "Yet", "Still", "Though"],
+    "Therefore": ["So", "Thus", "As a result"],
+
+    # Complex phrases
+    "particularly in": ["especially in", "mainly in", "most of all in"],
+    "across many": ["in many", "throughout", "all over"],
+    "despite various": ["even with many", "in spite of several"],
+
+    # Full patterns
+    "The current state of": ["How things stand with", "The present situation of"],
+    "not only affects": ["doesn't just impact", "not just influences"],
+    "but also contributes to": ["but also leads to", "but also results in"],
+}
+
+TRANSFORMATION_MATCHER = PhraseMatcher(TRANSFORMATIONS)
+
+# Per-pass replacement rates for each mode; the rate decays by 0.01 per pass.
+PASS_RATES = {
+    mode: tuple(0.999 - (pass_num * 0.01) for pass_num in range(num_passes))
+    for mode, num_passes in {"Basic": 3, "Aggressive": 6, "Enhanced": 9}.items()
+}
+
+CONTRACTIONS = {
+    "don't": "do not", "doesn't": "does not", "didn't": "did not",
+    "can't": "cannot", "couldn't": "could not", "wouldn't": "would not",
+    "shouldn't": "should not", "won't": "will not", "isn't": "is not",
+    "aren't": "are not", "wasn't": "was not", "weren't": "were not",
+    "haven't": "have not", "hasn't": "has not", "hadn't": "had not"
+}
+
+CONTRACTION_PATTERN = re.compile(r'\b(?:' + trie_pattern(CONTRACTIONS) + r')\b', re.IGNORECASE)
+
+
+def expand_contraction(match):
+    return CONTRACTIONS[match.group(0).lower()]
+
+
+FORMAL_TO_CASUAL = {
+    "In addition,": ["Also,", "Plus,"],
+    "Moreover,": ["Also,", "What's more,"],
+    "Furthermore,": ["Also,", "Plus,"],
+    "Therefore,": ["So,", "Thus,"],
+}
+
+STRUCTURE_CONNECTORS = [", and", ", which", ", but", ", so", "—"]
+
+STARTERS = ["Basically,", "Actually,", "In fact,", "Essentially,"]
+
+# Sentences opening with any of these never get a conversational starter.
+NO_STARTER_PREFIXES = tuple(STARTERS + ["The", "A", "This"])
+
+EMPHASIS = [
+    (re.compile(r" is "), " really is "),
+    (re.compile(r" are "), " actually are "),
+    (re.compile(r" shows "), " clearly shows "),
+]
+
+COMMON_TYPOS = {
+    "the": ["teh"], "and": ["adn"], "that": ["taht"],
+    "with": ["wtih"], "this": ["tihs"], "from": ["form"],
+    "have": ["ahve"], "would": ["woudl"], "their": ["thier"]
+}
+
+SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([.,;:!?])')
+MISSING_SPACE_AFTER_PUNCTUATION = re.compile(r'([.,;:!?])([^\s])')
+SPACE_AROUND_APOSTROPHE = re.compile(r"\s+'|'\s+")
+WHITESPACE_RUN = re.compile(r'\s+')
@@ -0,0 +1,263 @@
+"""
+Bulk humanness scoring.
+
+score_texts() computes calculate_humanness_score's metrics for many documents
+at once. Each text is split into words and sentences once and scanned once
+with a single combined regex; the length and variance statistics and the
+scores of all documents are then computed together with NumPy. The result is
+columnar: a dict of arrays with one entry per document.
+
+IncrementalScorer scores successive versions of one text (as it is being
+edited), recomputing only the sentences that changed.
+
+Sentences are split by NLTK's Punkt tokenizer, or by the faster rule-based
+splitter of transformer.segmenter with segmenter="regex".
+"""
+import re
+from collections import Counter
+
+import numpy as np
+
+TRANSITION_WORDS = frozenset([
+    "however", "nevertheless", "therefore", "thus", "furthermore", "moreover", "actually", "basically",
+])
+FILLER_WORDS = frozenset(["um", "like", "basically", "actually", "just"])
+# Two-word fillers, by their first word.
+FILLER_PHRASES = {"you": "you know", "sort": "sort of"}
+
+# Metrics returned by calculate_humanness_score, in order.
+METRICS = [
+    "word_count", "sentence_count", "avg_word_length", "avg_sentence_length",
+    "contractions", "transitions", "fillers",
+]
+
+# One scan of the lowercased text finds everything the three separate
+# patterns used to count: every apostrophe (a contraction, \b\w+'[a-z]+\b, is
+# then checked around it on the original text, since its letters after the
+# apostrophe must be lowercase) and every transition or filler word. The
+# second word of a two-word filler is only looked ahead at, so it is still
+# seen on its own.
+_MARKERS_SOURCE = r"'|\b(?:{words}|you(?= know(?!\w))|sort(?= of(?!\w)))(?!\w)".format(
+    words="|".join(sorted(TRANSITION_WORDS | FILLER_WORDS))
+)
+_MARKERS = re.compile(_MARKERS_SOURCE)
+# For the rare text whose lowercase form has a different length.
+_MARKERS_IGNORECASE = re.compile(_MARKERS_SOURCE, re.IGNORECASE)
+
+
+def score_texts(texts, segmenter="punkt"):
+    """
+    Score every text in `texts`, returning a dict of NumPy arrays: "score",
+    the calculate_humanness_score metrics, and "sentence_variance".
+    """
+    from transformer.segmenter import sent_tokenize
+
+    texts = list(texts)
+    count = len(texts)
+    columns = {name: np.zeros(count, dtype=np.int64) for name in [
+        "word_count", "sentence_count", "contractions", "transitions", "fillers",
+    ]}
+    characters = np.zeros(count, dtype=np.int64)
+    sentence_lengths = []
+
+    for i, text in enumerate(texts):
+        words = text.split()
+        if not words:
+            continue
+        lengths = [len(sentence.split()) for sentence in sent_tokenize(text, segmenter)]
+        sentence_lengths.extend(lengths)
+        columns["word_count"][i] = len(words)
+        columns["sentence_count"][i] = len(lengths)
+        characters[i] = sum(map(len, words))
+        (columns["contractions"][i], columns["transitions"][i],
+         columns["fillers"][i]) = _count_markers(text)
+
+    word_count = columns["word_count"]
+    sentence_count = columns["sentence_count"]
+    columns["avg_word_length"] = np.where(word_count > 0, characters / np.maximum(word_count, 1), 0.0)
+    columns["avg_sentence_length"] = np.where(
+        sentence_count > 0, word_count / np.maximum(sentence_count, 1), 0.0
+    )
+
+    columns["sentence_variance"] = _variances(sentence_lengths, sentence_count, columns["avg_sentence_length"])
+    columns["score"] = score_columns(columns)
+    return columns
+
+
+def score_text(text, segmenter="punkt"):
+    """Return (score, metrics) for one text, as calculate_humanness_score does."""
+    return _result(score_texts([text], segmenter))
+
+
+def score_columns(columns):
+    """The humanness score of each document from its metric columns."""
+    variance = columns["sentence_variance"]
+    score = (
+        50
+        + np.where(variance > 10, 20, np.where(variance > 5, 10, 0))
+        + np.minimum(15, columns["contractions"] * 3)
+        + np.minimum(15, columns["transitions"] * 3)
+        + np.minimum(10, columns["fillers"] * 2)
+    )
+    score = np.clip(score, 0, 100)
+    # Empty documents score 0.
+    return np.where(columns["word_count"] > 0, score, 0)
+
+
+class IncrementalScorer:
+    """
+    Humanness scoring for successive versions of the same text.
+
+    Each sentence's contributions (word count, squared word count, characters,
+    contraction, transition and filler counts) are kept in a dict keyed by the
+    sentence, along with running totals over the current version. score()
+    computes contributions only for sentences absent from the previous version
+    and updates the totals for the sentences that appeared or disappeared; the
+    sentence-length variance follows from the totals. Results are identical to
+    calculate_humanness_score(text).
+    """
+
+    def __init__(self, segmenter="punkt"):
+        self.segmenter = segmenter
+        # sentence -> (occurrences in the current version, contributions)
+        self._sentences = {}
+        self._totals = np.zeros(len(_CONTRIBUTIONS), dtype=np.int64)
+        # Sentences whose contributions the last call had to compute.
+        self.recomputed = 0
+
+    def score(self, text):
+        from transformer.segmenter import sent_tokenize
+
+        sentences = sent_tokenize(text, self.segmenter)
+        counts = Counter(sentences)
+        self.recomputed = 0
+        for sentence in counts.keys() | self._sentences.keys():
+            occurrences, contributions = self._sentences.get(sentence, (0, None))
+            delta = counts.get(sentence, 0) - occurrences
+            if not delta:
+                continue
+            if contributions is None:
+                contributions = _sentence_contributions(sentence)
+                self.recomputed += 1
+            self._totals += delta * contributions
+            if occurrences + delta:
+                self._sentences[sentence] = (occurrences + delta, contributions)
+            else:
+                del self._sentences[sentence]
+
+        totals = dict(zip(_CONTRIBUTIONS, self._totals.tolist()))
+        if totals["lowercase_changes_length"] or not _splits_at_whitespace(text, sentences):
+            # Per-sentence sums would not match a scan of the whole text.
+            return score_text(text, self.segmenter)
+        if not totals["words"]:
+            return 0, {}
+
+        sentence_count = totals["sentences"]
+        columns = {
+            "word_count": np.array([totals["words"]]),
+            "sentence_count": np.array([sentence_count]),
+            "avg_word_length": np.array([totals["characters"] / totals["words"]]),
+            "avg_sentence_length": np.array([totals["words"] / sentence_count]),
+            "contractions": np.array([totals["contractions"]]),
+            "transitions": np.array([totals["transitions"]]),
+            "fillers": np.array([totals["fillers"]]),
+        }
+        # Exact variance from the totals: numerator / sentence_count ** 2.
+        numerator = sentence_count * totals["squared_words"] - totals["words"] ** 2
+        denominator = sentence_count ** 2
+        if any(abs(numerator - threshold * denominator) <= threshold * denominator * 1e-6
+               for threshold in _VARIANCE_THRESHOLDS):
+            # On (or within rounding of) a threshold, the side it falls on is
+            # decided by the floating-point sum a full recomputation does.
+            variance = _variances(
+                [self._sentences[sentence][1][0] for sentence in sentences],
+                columns["sentence_count"], columns["avg_sentence_length"],
+            )[0]
+        else:
+            variance = numerator / denominator
+        columns["sentence_variance"] = np.array([variance])
+        columns["score"] = score_columns(columns)
+        return _result(columns)
+
+
+# Per-sentence contributions kept by IncrementalScorer, in order.
+_CONTRIBUTIONS = [
+    "words", "squared_words", "characters", "contractions", "transitions", "fillers",
+    "lowercase_changes_length", "sentences",
+]
+_VARIANCE_THRESHOLDS = (5, 10)
+
+
+def _sentence_contributions(sentence):
+    words = sentence.split()
+    return np.array([
+        len(words), len(words) ** 2, sum(map(len, words)), *_count_markers(sentence),
+        len(sentence.lower()) != len(sentence), 1,
+    ], dtype=np.int64)
+
+
+def _splits_at_whitespace(text, sentences):
+    """
+    True if `sentences` cover every non-space character of `text` and are
+    separated by whitespace, so that counts over the whole text are the sums
+    of counts over the sentences.
+    """
+    return text.split() == " ".join(sentences).split()
+
+
+def _variances(sentence_lengths, sentence_count, avg_sentence_length):
+    """
+    Population variance of each document's sentence lengths around its
+    average sentence length, for all documents in one pass.
+    """
+    document = np.repeat(np.arange(len(sentence_count)), sentence_count)
+    deviations = np.asarray(sentence_lengths, dtype=np.float64) - avg_sentence_length[document]
+    return (
+        np.bincount(document, weights=deviations ** 2, minlength=len(sentence_count))
+        / np.maximum(sentence_count, 1)
+    )
+
+
+def _result(columns, i=0):
+    """(score, metrics) of document `i`, in calculate_humanness_score's types."""
+    if not columns["word_count"][i]:
+        return 0, {}
+    return int(columns["score"][i]), {name: columns[name][i].item() for name in METRICS}
+
+
+def _count_markers(text):
+    """Return (contractions, transitions, fillers) found in `text`."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        matches = _MARKERS.finditer(lowered)
+    else:
+        matches = _MARKERS_IGNORECASE.finditer(text)
+
+    contractions = transitions = fillers = 0
+    # A contraction consumes the letters after its apostrophe, which
+    # therefore cannot start another contraction ("a'b'c" counts once).
+    consumed = 0
+    for match in matches:
+        word = match.group().lower()
+        if word == "'":
+            apostrophe = match.start()
+            start = apostrophe
+            while start > 0 and _is_word_char(text[start - 1]):
+                start -= 1
+            end = apostrophe + 1
+            while end < len(text) and "a" <= text[end] <= "z":
+                end += 1
+            if (consumed <= start < apostrophe < end - 1
+                    and (end == len(text) or not _is_word_char(text[end]))):
+                contractions += 1
+                consumed = end
+            continue
+        if word in TRANSITION_WORDS:
+            transitions += 1
+        if word in FILLER_WORDS or word in FILLER_PHRASES:
+            fillers += 1
+    return contractions, transitions, fillers
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
@@ -0,0 +1,143 @@
+"""
+Rule-based sentence and word segmentation, compiled once at import time.
+
+split_sentences() reproduces the decisions NLTK's English Punkt model makes
+on ordinary prose with a single regular-expression scan: a sentence ends at
+".", "?" or "!" (with any closing quotes or brackets) followed by
+whitespace, except after a known abbreviation, an initial, or an ellipsis
+or number followed by a lowercase word. Where Punkt relies on word
+statistics it learned (is the capitalized word after "etc." a sentence
+starter or a name?) the rules approximate it. split_words() approximates
+NLTK's word_tokenize (the Treebank conventions: "don't" -> "do", "n't";
+punctuation split off; the sentence-final period separate). Neither needs
+NLTK or its data.
+
+sent_tokenize() and word_tokenize() take a `segmenter`: "regex" (the
+default, these rules) or "punkt" (NLTK, loaded on first use), so callers
+can fall back to Punkt. python -m benchmarks.check_segmenter_agreement
+measures the agreement with Punkt on a reference corpus.
+"""
+import re
+
+SEGMENTERS = ("regex", "punkt")
+# NLTK data the "punkt" segmenter loads (see transformer.resources).
+PUNKT_RESOURCES = ["punkt_tab"]
+
+# Abbreviations (lowercase, without the final period) after which Punkt
+# does not end a sentence unless a common capitalized word follows.
+ABBREVIATIONS = frozenset("""
+    approx apr aug capt cf cmdr co col corp dec dept e.g est al etc feb fig figs
+    ft gen gov hon i.e inc jan jul jun lt ltd maj mar messrs mt no nos nov oct
+    p.m a.m pp rep rev sen sep sept sgt vol vols vs u.s u.k
+""".split())
+# Titles come before names, which Punkt never takes for sentence starters.
+TITLES = frozenset("dr jr mr mrs ms prof sr st".split())
+
+_CLOSING = "\"')\\]}‘’“”\xab\xbb"
+# A possible sentence end: the marks, closing punctuation, and (looked
+# ahead) the next whitespace-delimited token. A spaced ellipsis (". . .")
+# is three ends, as it is for Punkt.
+_CANDIDATE = re.compile(r"(?P<end>[.?!]+)[" + re.escape(_CLOSING) + r"]*(?=\s+(?P<next>\S+))")
+# Characters Punkt splits off words.
+_NON_WORD = ")\";}\\]*:@'({\\[‘’“”\xab\xbb!?"
+# The token a period ends. It can start with one of these characters ("'t.").
+_TOKEN_BEFORE = re.compile(r"['‘’“”\xab\xbb!?]?[^\s" + _NON_WORD + r"]*$")
+# Punkt decides on the text up to the end of the next token, so a sentence
+# end inside that token (as in 'etc. "yes!"') ends the sentence too.
+_INNER_END = re.compile(r"[.?!][" + _NON_WORD + r"]")
+_NUMBER = re.compile(r"-?[.,]?\d[\d,.-]*$")
+_ACRONYM = re.compile(r"(?:[^\W\d]\.)+[^\W\d]$")
+# Characters Punkt's orthographic heuristic never takes for a sentence start.
+_NOT_STARTERS = ";:,.!?"
+
+_WORD_TOKEN = re.compile(r"""
+    (?i:can(?=not\b)|gon(?=na\b)|got(?=ta\b)|wan(?=na\s)|gim(?=me\b)|lem(?=me\b))
+  | \w+(?=n't\b)                                    # "do" of "don't"
+  | (?i:n't)\b
+  | (?<=\w)'(?:[sSmMdD]|ll|LL|re|RE|ve|VE)\b        # clitics: 's 'm 'd 'll 're 've
+  | \d+(?:[.,:]\d+)*                                # 3.14, 1,000, 10:30
+    (?:\.(?![\])}>"'”’]*\s*$)(?!\.))?
+  | \w+(?:(?:[-./]|'(?!(?:[sSmMdDtT]|ll|LL|re|RE|ve|VE)\b))\w+)*
+    (?:\.(?![\])}>"'”’]*\s*$)(?!\.))?    # keeps "Mr." and "U.S.", not the final period
+  | \.{2,}|-{2,}
+  | [^\w\s]
+""", re.VERBOSE)
+
+
+def split_sentences(text):
+    """The sentences of `text`, as NLTK's sent_tokenize would split it."""
+    sentences = []
+    start = 0
+    for match in _CANDIDATE.finditer(text):
+        if _is_boundary(text, match):
+            sentence = text[start:match.end()]
+            if sentence:
+                sentences.append(sentence)
+            start = match.start("next")
+    sentence = text[start:len(text.rstrip())]
+    if sentence[-2:-1] in ("?", "!") and sentence[-1:] in ("?", "!"):
+        # Punkt splits the last mark off a text ending in "?!", "!!" and so on.
+        sentences.extend([sentence[:-1], sentence[-1]])
+    elif sentence:
+        sentences.append(sentence)
+    return sentences
+
+
+def _is_boundary(text, match):
+    end = match.group("end")
+    if "?" in end or "!" in end:
+        return True
+    following = match.group("next")
+    return _ends_before(text, match, end, following) or _INNER_END.search(following) is not None
+
+
+def _ends_before(text, match, end, following):
+    """Whether a "." or an ellipsis ends a sentence before the token `following`."""
+    # A capitalized word that starts sentences, rather than a title.
+    starter = following[0].isupper() and following.rstrip(".").lower() not in TITLES
+    if len(end) > 1:
+        return starter
+
+    before = text[max(0, match.start() - 64):match.start()]
+    token = "" if not before or before[-1].isspace() else before.rsplit(None, 1)[-1]
+    token = _TOKEN_BEFORE.search(token).group().lstrip("-,&#`")
+    if not token:
+        return True
+    lower = token.lower()
+    if lower in TITLES:
+        return False
+    if lower in ABBREVIATIONS or lower.rsplit("-", 1)[-1] in ABBREVIATIONS or _ACRONYM.match(token):
+        return starter
+    first = following[0]
+    if len(token) == 1 and token.isalpha():
+        # An initial, unless no word follows.
+        return not first.isalpha() and first not in _NOT_STARTERS
+    if _NUMBER.match(token):
+        return not first.islower() and first not in _NOT_STARTERS
+    return True
+
+
+def split_words(text):
+    """The words and punctuation of `text`, as NLTK's word_tokenize would split them."""
+    return [token for sentence in split_sentences(text) for token in _WORD_TOKEN.findall(sentence)]
+
+
+def sent_tokenize(text, segmenter="regex"):
+    """split_sentences(text), or NLTK's sent_tokenize with segmenter="punkt"."""
+    if segmenter == "regex":
+        return split_sentences(text)
+    if segmenter == "punkt":
+        # NLTK takes a few hundred milliseconds to import, so defer it to first use
+        from nltk.tokenize import sent_tokenize
+        return sent_tokenize(text)
+    raise ValueError(f"unknown segmenter {segmenter!r}; choose one of {list(SEGMENTERS)}")
+
+
+def word_tokenize(text, segmenter="regex"):
+    """split_words(text), or NLTK's word_tokenize with segmenter="punkt"."""
+    if segmenter == "regex":
+        return split_words(text)
+    if segmenter == "punkt":
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text)
+    raise ValueError(f"unknown segmenter {segmenter!r}; choose one of {list(SEGMENTERS)}")
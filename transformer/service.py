@@ -0,0 +1,461 @@
+"""
+HTTP service exposing the humanizers to other services.
+
+    python -m transformer.service [--host 127.0.0.1] [--port 8000] [--workers 4]
+
+Endpoints (JSON in, JSON out):
+
+    POST /humanize/advanced  {"text", "mode", "techniques", "seed"} -> {"text"}
+    POST /humanize/academic  {"text", "use_passive", "use_synonyms", "seed"} -> {"text"}
+    POST /score              {"text"} -> {"score", "metrics"}
+    GET  /metrics            counters, latency percentiles, queue depths, caches
+    GET  /metrics/prometheus per-stage humanizer totals, as Prometheus text (with --instrument)
+    GET  /health
+
+The server is a plain asyncio loop; all CPU work runs in a bounded thread
+pool. Academic requests are not run one by one: they wait in a queue for up
+to --batch-window-ms and are then humanized together, so that the synonyms
+of the whole batch are scored with a single model encode. Requests beyond
+--max-pending (admitted but not yet answered), or academic requests beyond
+--max-queue waiting for a batch, are refused at once with 503 and
+Retry-After instead of piling up.
+
+The service refuses to start without the NLTK data the advanced engine and
+/score need. Academic requests are answered with 503, naming the missing
+data, until the academic engine's data is installed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from transformer import registry, resources
+from transformer.instrumentation import PROMETHEUS_CONTENT_TYPE, StageRecorder, prometheus_text
+
+MODES = ["Basic", "Aggressive", "Enhanced"]
+TECHNIQUES = ["typos", "punctuation", "repetition", "formatting"]
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Service:
+    def __init__(self, workers=4, max_pending=256, max_queue=128, max_batch=32,
+                 batch_window=0.005, max_body=10_000_000, cache_dir=None, synonym_table_path=None,
+                 embedding_backend="torch", instrument=False):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_body = max_body
+        self.synonym_table_path = synonym_table_path
+        self.embedding_backend = embedding_backend
+        self.cache = registry.result_cache(cache_dir) if cache_dir else None
+        # Per-stage timings of every humanize call, when instrumented.
+        self.stages = StageRecorder() if instrument else None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="humanize")
+
+        self._advanced = None
+        self._academic = None
+        self._engine_lock = threading.Lock()
+        self._academic_queue = None
+        self._batch_slots = None
+        self._batcher = None
+
+        self.started = time.time()
+        self.pending = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+        # path -> {"requests", "errors", "latencies"}; latencies of the last
+        # 2048 answered requests, in seconds.
+        self.endpoints = {}
+
+    # Engines are created on first use, in a worker thread.
+
+    def advanced(self):
+        with self._engine_lock:
+            if self._advanced is None:
+                from transformer.humanizer import AdvancedHumanizer
+                self._advanced = AdvancedHumanizer(cache=self.cache, observer=self.stages)
+            return self._advanced
+
+    def academic(self):
+        with self._engine_lock:
+            if self._academic is None:
+                from transformer.app import ACADEMIC_RESOURCES, AcademicTextHumanizer
+                missing = resources.missing_resources(ACADEMIC_RESOURCES)
+                if missing:
+                    raise HTTPError(503, f"academic engine unavailable, missing NLTK data: {', '.join(missing)}")
+                self._academic = AcademicTextHumanizer(
+                    cache=self.cache, synonym_table_path=self.synonym_table_path,
+                    embedding_backend=self.embedding_backend, observer=self.stages,
+                )
+            return self._academic
+
+    async def start(self, host="127.0.0.1", port=8000):
+        self._academic_queue = asyncio.Queue(maxsize=self.max_queue)
+        # Academic batches running at once; each holds one worker thread.
+        self._batch_slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.ensure_future(self._batch_academic())
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def stop(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self.executor.shutdown(wait=False)
+
+    # HTTP
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    await self._respond(writer, error.status, {"error": str(error)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, body, keep_alive = request
+                status, payload, headers = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive, headers)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Return (method, path, body, keep_alive), or None once the client has closed."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if not error.partial.strip():
+                return None
+            raise HTTPError(400, "incomplete request")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "request head too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(411, "chunked bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > self.max_body:
+            raise HTTPError(413, f"body larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target.split("?", 1)[0], body, keep_alive
+
+    async def _respond(self, writer, status, payload, keep_alive, headers=None):
+        # Payloads are sent as JSON, except the Prometheus text.
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        """Route one request, returning (status, payload, extra headers)."""
+        routes = {
+            "/humanize/advanced": ("POST", self._humanize_advanced),
+            "/humanize/academic": ("POST", self._humanize_academic),
+            "/score": ("POST", self._score),
+            "/metrics": ("GET", self._metrics),
+            "/metrics/prometheus": ("GET", self._prometheus),
+            "/health": ("GET", self._health),
+        }
+        if path not in routes:
+            return 404, {"error": f"no endpoint {path}"}, None
+        expected, handler = routes[path]
+        if method != expected:
+            return 405, {"error": f"{path} expects {expected}"}, {"Allow": expected}
+        if expected == "GET":
+            try:
+                return 200, handler(), None
+            except HTTPError as error:
+                return error.status, {"error": str(error)}, None
+
+        endpoint = self.endpoints.setdefault(path, {"requests": 0, "errors": 0, "latencies": deque(maxlen=2048)})
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return 503, {"error": "overloaded, retry later"}, {"Retry-After": "1"}
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(400, "body is not valid JSON")
+            if not isinstance(request, dict):
+                raise HTTPError(400, "body must be a JSON object")
+            result = await handler(request)
+            status = 200
+        except HTTPError as error:
+            status, result = error.status, {"error": str(error)}
+        except Exception as error:
+            status, result = 500, {"error": f"{type(error).__name__}: {error}"}
+        finally:
+            self.pending -= 1
+        endpoint["requests"] += 1
+        if status != 200:
+            endpoint["errors"] += 1
+        else:
+            endpoint["latencies"].append(time.perf_counter() - start)
+        return status, result, {"Retry-After": "1"} if status == 503 else None
+
+    # Endpoints
+
+    async def _humanize_advanced(self, request):
+        text = _text(request)
+        mode = request.get("mode", "Enhanced")
+        if mode not in MODES:
+            raise HTTPError(400, f"mode must be one of {MODES}")
+        techniques = request.get("techniques") or []
+        if not isinstance(techniques, list) or not set(techniques) <= set(TECHNIQUES):
+            raise HTTPError(400, f"techniques must be a list of {TECHNIQUES}")
+        seed = _seed(request)
+
+        def run():
+            return self.advanced().humanize_text(text, mode, techniques, seed=seed)
+
+        loop = asyncio.get_running_loop()
+        return {"text": await loop.run_in_executor(self.executor, run)}
+
+    async def _humanize_academic(self, request):
+        item = (_text(request), _flag(request, "use_passive"), _flag(request, "use_synonyms"), _seed(request))
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._academic_queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPError(503, "academic queue is full, retry later")
+        return {"text": await future}
+
+    async def _score(self, request):
+        from transformer.scoring import score_text
+
+        text = _text(request)
+        loop = asyncio.get_running_loop()
+        score, metrics = await loop.run_in_executor(self.executor, score_text, text)
+        return {"score": score, "metrics": metrics}
+
+    def _health(self):
+        return {"status": "ok"}
+
+    def _metrics(self):
+        endpoints = {}
+        for path, endpoint in self.endpoints.items():
+            latencies = sorted(endpoint["latencies"])
+            endpoints[path] = {
+                "requests": endpoint["requests"],
+                "errors": endpoint["errors"],
+                "p50_ms": _percentile(latencies, 50) * 1000,
+                "p99_ms": _percentile(latencies, 99) * 1000,
+            }
+        embeddings = None
+        if self._academic is not None and self._academic.embeddings is not None:
+            embeddings = self._academic.embeddings.stats()
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "academic_queue_depth": self._academic_queue.qsize() if self._academic_queue else 0,
+            "max_queue": self.max_queue,
+            "batches": {
+                "count": self.batches,
+                "requests": self.batched_requests,
+                "mean_size": self.batched_requests / self.batches if self.batches else 0.0,
+                "largest": self.largest_batch,
+            },
+            "endpoints": endpoints,
+            "embedding_cache": embeddings,
+            "result_cache": self.cache.stats() if self.cache is not None else None,
+            "resources": registry.resource_metrics(),
+        }
+
+    def _prometheus(self):
+        if self.stages is None:
+            raise HTTPError(404, "stage metrics are off; start the service with --instrument")
+        return prometheus_text(self.stages)
+
+    # Academic micro-batching
+
+    async def _batch_academic(self):
+        while True:
+            await self._batch_slots.acquire()
+            batch = [await self._academic_queue.get()]
+            if self._academic_queue.qsize() < self.max_batch - 1:
+                # Give concurrent requests the batch window to arrive.
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._academic_queue.empty():
+                batch.append(self._academic_queue.get_nowait())
+
+            self.batches += 1
+            self.batched_requests += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            outputs = await loop.run_in_executor(
+                self.executor, self._humanize_batch, [item for item, _ in batch]
+            )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        finally:
+            self._batch_slots.release()
+
+    def _humanize_batch(self, items):
+        """
+        humanize_text for each (text, use_passive, use_synonyms, seed) of
+        `items`, with one parse pass and one synonym selection (so one model
+        encode) for the whole batch.
+        """
+        return self.academic().humanize_each(items)
+
+
+def _text(request):
+    text = request.get("text")
+    if not isinstance(text, str):
+        raise HTTPError(400, '"text" must be a string')
+    return text
+
+
+def _seed(request):
+    seed = request.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        raise HTTPError(400, '"seed" must be an integer')
+    return seed
+
+
+def _flag(request, name):
+    value = request.get(name, False)
+    if not isinstance(value, bool):
+        raise HTTPError(400, f'"{name}" must be true or false')
+    return value
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+async def serve(host, port, service, preload=()):
+    loop = asyncio.get_running_loop()
+    for engine in preload:
+        await loop.run_in_executor(service.executor, getattr(service, engine))
+    server = await service.start(host, port)
+    print(f"listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    from transformer.similarity import default_table_path
+
+    parser = argparse.ArgumentParser(prog="python -m transformer.service",
+                                     description="Serve the humanizers over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="threads running humanizer work")
+    parser.add_argument("--max-pending", type=int, default=256,
+                        help="requests admitted at once; more are refused with 503")
+    parser.add_argument("--max-queue", type=int, default=128,
+                        help="academic requests waiting to be batched; more are refused with 503")
+    parser.add_argument("--max-batch", type=int, default=32, help="academic requests per batch")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0,
+                        help="how long an academic request waits for others to batch with")
+    parser.add_argument("--cache-dir", help="reuse outputs of seeded requests stored here")
+    parser.add_argument("--synonym-table", nargs="?", const=default_table_path(),
+                        help="choose academic synonyms from the precomputed similarity table "
+                             "instead of loading the embedding model")
+    parser.add_argument("--embedding-backend", choices=["torch", "int8", "onnx"], default="torch",
+                        help="how the academic engine's embedding model is run")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time every humanizer stage and serve the totals at /metrics/prometheus")
+    parser.add_argument("--preload", nargs="*", choices=["advanced", "academic"], default=[],
+                        help="load these engines before accepting requests")
+    args = parser.parse_args(argv)
+
+    # The advanced engine and /score split sentences with Punkt; the academic
+    # engine's data is checked when it is first loaded.
+    from transformer.app import ACADEMIC_RESOURCES
+    from transformer.segmenter import PUNKT_RESOURCES
+    needed = PUNKT_RESOURCES + (ACADEMIC_RESOURCES if "academic" in args.preload else [])
+    missing = resources.missing_resources(list(dict.fromkeys(needed)))
+    if missing:
+        print(f"error: missing NLTK data: {', '.join(missing)}; install it with nltk.download()",
+              file=sys.stderr)
+        return 2
+
+    service = Service(
+        workers=args.workers, max_pending=args.max_pending, max_queue=args.max_queue,
+        max_batch=args.max_batch,
+        batch_window=args.batch_window_ms / 1000, cache_dir=args.cache_dir,
+        synonym_table_path=args.synonym_table, embedding_backend=args.embedding_backend,
+        instrument=args.instrument,
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, service, args.preload))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
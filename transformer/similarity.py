@@ -0,0 +1,151 @@
+"""
+Precomputed synonym choices, so the academic humanizer can run without its
+embedding model.
+
+The synonym picked for a word depends only on the word and its part of
+speech: the synonyms come from WordNet, and the pick is the one whose
+embedding is closest to the word's. build_table() runs the model once,
+offline, over every (word, part of speech) of the synonym index (each word
+both lowercase and capitalized, as it appears at the start of a sentence)
+and stores the best synonym with its cosine similarity. The threshold is
+applied at lookup time. The table is a marisa-trie file that
+SimilarityTable memory-maps read-only; using it needs neither torch nor
+sentence-transformers.
+
+    python -m transformer.similarity [--model NAME] [--index PATH] [--output PATH]
+"""
+import argparse
+import os
+import re
+import struct
+import sys
+import time
+
+from transformer import resources
+from transformer.synonyms import WORDNET_POS, SynonymIndex, build_index, default_index_path
+
+DEFAULT_MODEL = "paraphrase-MiniLM-L6-v2"
+# Key holding the name of the model the table was built with (no word is empty).
+MODEL_KEY = "\tmodel"
+# Value layout: little-endian float32 similarity, then the synonym in UTF-8.
+SCORE = struct.Struct("<f")
+
+
+def default_table_path(model_name=DEFAULT_MODEL):
+    name = re.sub(r"[^\w.-]+", "_", model_name)
+    return os.path.join(resources.default_cache_dir(), f"synonym-similarity-{name}.marisa")
+
+
+class SimilarityTable:
+    """Read-only view of a table written by build_table()."""
+
+    def __init__(self, path):
+        import marisa_trie
+
+        self.path = path
+        self._trie = marisa_trie.BytesTrie()
+        self._trie.mmap(path)
+        values = self._trie.get(MODEL_KEY)
+        self.model_name = values[0].decode("utf-8") if values else None
+
+    def __len__(self):
+        return len(self._trie)
+
+    def best(self, word, wn_pos):
+        """
+        (synonym, similarity) of the synonym closest to `word`, or None if
+        it has no synonyms for `wn_pos`. A form that was not precomputed
+        (such as an all-caps word) uses its lowercase entry.
+        """
+        values = self._trie.get(f"{word}\t{wn_pos}") or self._trie.get(f"{word.lower()}\t{wn_pos}")
+        if not values:
+            return None
+        value = values[0]
+        return value[SCORE.size:].decode("utf-8"), SCORE.unpack_from(value)[0]
+
+    def closest(self, word, wn_pos, threshold=0.5):
+        """Same as closest_synonyms() for `word` and its synonyms for `wn_pos`."""
+        found = self.best(word, wn_pos)
+        return found[0] if found is not None and found[1] >= threshold else None
+
+    def closest_among(self, word, synonyms, threshold=0.5):
+        """
+        closest() for the part of speech whose best synonym is one of
+        `synonyms` and most similar to `word`, as the model would choose
+        among `synonyms`. Ties go to the earlier part of speech.
+        """
+        best = None
+        for wn_pos in WORDNET_POS:
+            found = self.best(word, wn_pos)
+            if found is not None and found[0] in synonyms and (best is None or found[1] > best[1]):
+                best = found
+        return best[0] if best is not None and best[1] >= threshold else None
+
+
+def build_table(path=None, model_name=DEFAULT_MODEL, index=None, block=4096, progress=None):
+    """
+    Write the table for every entry of `index` (a SynonymIndex) to `path`
+    and return the number of entries. Entries are scored `block` at a
+    time; `progress(done, total)` is called after each block.
+    """
+    import marisa_trie
+
+    from transformer import registry
+    from transformer.embeddings import EmbeddingCache, best_synonyms
+
+    path = path or default_table_path(model_name)
+    # Entries sorted by word so that consecutive blocks share synonyms in
+    # the embedding cache.
+    candidates = []
+    for word, wn_pos, synonyms in sorted(index.entries()):
+        for form in dict.fromkeys([word, word.capitalize()]):
+            candidates.append((form, wn_pos, synonyms))
+
+    cache = EmbeddingCache(registry.sentence_transformer(model_name), model_name, max_entries=200_000)
+    items = [(MODEL_KEY, model_name.encode("utf-8"))]
+    for start in range(0, len(candidates), block):
+        chunk = candidates[start:start + block]
+        for (form, wn_pos, _), (synonym, score) in zip(
+            chunk, best_synonyms(cache, [(form, synonyms) for form, _, synonyms in chunk])
+        ):
+            items.append((f"{form}\t{wn_pos}", SCORE.pack(score) + synonym.encode("utf-8")))
+        if progress is not None:
+            progress(min(start + block, len(candidates)), len(candidates))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    marisa_trie.BytesTrie(items).save(partial)
+    os.replace(partial, path)
+    return len(items) - 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precomputed synonym-similarity table.")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--index", default=None,
+                        help=f"synonym index, built first if missing (default: {default_index_path()})")
+    parser.add_argument("--output", default=None, help="table file (default: in the humanizer cache directory)")
+    args = parser.parse_args(argv)
+
+    index_path = args.index or default_index_path()
+    if not os.path.exists(index_path):
+        if resources.ensure_resources(["wordnet"]):
+            print("WordNet is not installed; run nltk.download('wordnet') first.", file=sys.stderr)
+            return 1
+        build_index(index_path)
+
+    path = args.output or default_table_path(args.model)
+    start = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} entries", end="", file=sys.stderr, flush=True)
+
+    entries = build_table(path, args.model, SynonymIndex(index_path), progress=progress)
+    print(file=sys.stderr)
+    print(f"{entries} entries written to {path} in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
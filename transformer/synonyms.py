@@ -0,0 +1,166 @@
+"""
+Precomputed WordNet synonym index for the academic humanizer.
+
+build_index() walks WordNet once, offline, and records for every word form
+that wordnet.synsets() can resolve (lemmas, their regular inflections and
+WordNet's irregular forms) whether it has any synsets and which synonyms
+wordnet_synonyms() returns for each part of speech. The result is a
+marisa-trie file; SynonymIndex memory-maps it read-only, so every worker
+process shares one copy through the page cache.
+
+    python -m transformer.synonyms [--output PATH]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from transformer import resources
+
+INDEX_NAME = "wordnet-synonyms.marisa"
+# WordNet parts of speech: adjective, noun, adverb, verb.
+WORDNET_POS = ("a", "n", "r", "v")
+# Separates the synonyms stored under one key (never part of a lemma name).
+SEPARATOR = "\x1f"
+
+# NLTK's WordNet reader loads itself on first access and reads every synset
+# by seeking shared file handles, so live lookups on it are serialized.
+_wordnet_lock = threading.Lock()
+
+
+def default_index_path():
+    return os.path.join(resources.default_cache_dir(), INDEX_NAME)
+
+
+def wordnet_pos(tag):
+    """Map a Penn Treebank tag to a WordNet part of speech, or None."""
+    return {"J": "a", "N": "n", "R": "r", "V": "v"}.get(tag[:1])
+
+
+def wordnet_known(word):
+    """Live lookup: whether `word` has any synset (bool(wordnet.synsets(word)))."""
+    from nltk.corpus import wordnet
+
+    with _wordnet_lock:
+        return bool(wordnet.synsets(word))
+
+
+def wordnet_synonyms(word, wn_pos, wordnet=None):
+    """Live lookup: lemma names of every synset of `word`, other than `word` itself."""
+    if wordnet is None:
+        from nltk.corpus import wordnet
+
+    synonyms = set()
+    with _wordnet_lock:
+        for syn in wordnet.synsets(word, pos=wn_pos):
+            for lemma in syn.lemmas():
+                lemma_name = lemma.name().replace('_', ' ')
+                if lemma_name.lower() != word.lower():
+                    synonyms.add(lemma_name)
+    # Sorted so that the order (and so tie-breaking between equally close
+    # synonyms) does not depend on string hashing.
+    return sorted(synonyms)
+
+
+class SynonymIndex:
+    """
+    Read-only view of an index written by build_index().
+
+    Keys are "<word>\\t<pos>" holding the synonyms, plus "<word>\\t" for
+    every form with at least one synset. Words are looked up lowercased,
+    as wordnet.synsets() does.
+    """
+
+    def __init__(self, path):
+        import marisa_trie
+
+        self.path = path
+        self._trie = marisa_trie.BytesTrie()
+        self._trie.mmap(path)
+
+    def __len__(self):
+        return len(self._trie)
+
+    def known(self, word):
+        """Same as bool(wordnet.synsets(word))."""
+        return word.lower() + "\t" in self._trie
+
+    def synonyms(self, word, wn_pos):
+        """Same as wordnet_synonyms(word, wn_pos)."""
+        values = self._trie.get(f"{word.lower()}\t{wn_pos}")
+        if not values or not values[0]:
+            return []
+        return values[0].decode("utf-8").split(SEPARATOR)
+
+    def entries(self):
+        """Yield (word, wn_pos, synonyms) for every word and part of speech that has synonyms."""
+        for key, value in self._trie.iteritems():
+            word, _, wn_pos = key.partition("\t")
+            if wn_pos:
+                yield word, wn_pos, value.decode("utf-8").split(SEPARATOR)
+
+
+def build_index(path=None, wordnet=None):
+    """Write the index for every WordNet word form to `path` and return the number of keys."""
+    import marisa_trie
+
+    if wordnet is None:
+        from nltk.corpus import wordnet
+
+    path = path or default_index_path()
+    items = []
+    for form in sorted(_word_forms(wordnet)):
+        if not wordnet.synsets(form):
+            continue
+        items.append((form + "\t", b""))
+        for wn_pos in WORDNET_POS:
+            synonyms = wordnet_synonyms(form, wn_pos, wordnet)
+            if synonyms:
+                items.append((f"{form}\t{wn_pos}", SEPARATOR.join(synonyms).encode("utf-8")))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Written next to the target and renamed, so processes that have the old
+    # index mapped keep a consistent file.
+    partial = f"{path}.{os.getpid()}.tmp"
+    marisa_trie.BytesTrie(items).save(partial)
+    os.replace(partial, path)
+    return len(items)
+
+
+def _word_forms(wordnet):
+    """
+    Every lowercase string for which wordnet.synsets() may return something:
+    the lemmas, the forms that one of WordNet's detachment rules maps back to
+    a lemma, and the irregular forms from the exception lists.
+    """
+    forms = set()
+    for wn_pos in WORDNET_POS:
+        substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS.get(wn_pos, [])
+        for lemma in wordnet.all_lemma_names(wn_pos):
+            forms.add(lemma)
+            for inflected, base in substitutions:
+                if lemma.endswith(base):
+                    forms.add(lemma[:len(lemma) - len(base)] + inflected)
+        forms.update(wordnet._exception_map[wn_pos])
+    return forms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precomputed WordNet synonym index.")
+    parser.add_argument("--output", default=None, help=f"index file (default: {default_index_path()})")
+    args = parser.parse_args(argv)
+
+    if resources.ensure_resources(["wordnet"]):
+        print("WordNet is not installed; run nltk.download('wordnet') first.", file=sys.stderr)
+        return 1
+    path = args.output or default_index_path()
+    start = time.perf_counter()
+    keys = build_index(path)
+    print(f"{keys} keys written to {path} in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())